@@ -0,0 +1,713 @@
+"""asyncio version of the city-wise sod farm crawl, built on patchright.async_api.
+
+Same CLI and output files as main.py, but one event loop drives many pages at once:
+searches, business detail pages and the review/image enrichment each have their own
+concurrency limit instead of one page sleeping through every wait.
+"""
+from patchright.async_api import async_playwright, Page, TimeoutError
+from main import (
+    FEED_HREFS_JS, FEED_GROWTH_JS, FEED_STATE_JS, SCROLL_FEED_JS, LISTING_CARDS_JS, FeedSaturationCheck,
+    BUSINESS_DETAIL_XPATHS, BUSINESS_DETAILS_JS, REVIEWS_AVERAGE_XPATH, Business, BusinessList, ProgressCsvWriter,
+    MAX_BLOCK_RETRIES, build_arg_parser, validate_args, build_states_to_scrape, apply_yield_schedule,
+    build_tile_planner, configure_proxy_pool, configure_refresh, business_from_listing_card, business_from_xhr_record,
+    claim_url, parse_business_details, extract_coordinates_from_url, extract_categories_from_url, print_final_report,
+    record_place_result,
+)
+from crawl_journal import CrawlJournal
+from place_index import PlaceIndex, canonical_place_id
+from maps_xhr_parser import XhrCapture
+from geo_tiles import parse_tile_label
+from city_scheduler import CityYieldStats
+from proxy_pool import PROXY_POOL, print_proxy_report
+from navigation import check_page_async, goto_async
+from block_detector import PageBlocked
+from refresh_index import REFRESH
+from selector_registry import SELECTORS
+from pacing import PACER, print_pacing_report
+from metrics import METRICS
+from resource_blocker import RESOURCE_BLOCKER
+from review_scraper import REVIEWS_JS, sanitize_filename, save_reviews
+from image_scraper import IMAGES_JS, save_images
+from urllib.parse import quote_plus
+import asyncio
+import itertools
+import os
+import time
+
+PLACE_LINKS_XPATH = '//a[contains(@href, "https://www.google.com/maps/place")]'
+
+
+async def scroll_to_load_all_results(page: Page, max_attempts=25, growth_timeout=6000, max_stalls=2,
+                                     saturation_check=None):
+    """async port of main.enhanced_scroll_to_load_all_results: waits on feed growth instead of sleeping"""
+    try:
+        await page.wait_for_function(FEED_GROWTH_JS, arg=0, timeout=10000)
+    except TimeoutError:
+        pass
+
+    state = await page.evaluate(FEED_STATE_JS)
+    stalls = 0
+    batches = 1
+    saturated = False
+    if saturation_check is not None:
+        saturation_check.start()
+        saturated = saturation_check.batch(await page.evaluate(FEED_HREFS_JS, 0))
+
+    for attempt in range(max_attempts):
+        if state["endOfList"]:
+            break
+        if saturated:
+            saved = saturation_check.stopped(state["count"], batches, max_attempts - attempt)
+            print(f"🛑 Feed saturated with already scraped places - stopping early (~{saved} scrolls saved)")
+            break
+
+        previous_count = state["count"]
+        try:
+            if not await page.evaluate(SCROLL_FEED_JS):
+                await page.mouse.wheel(0, 5000)
+            await page.wait_for_function(FEED_GROWTH_JS, arg=previous_count, timeout=growth_timeout)
+            stalls = 0
+        except TimeoutError:
+            stalls += 1
+            if stalls >= max_stalls:
+                break
+
+        state = await page.evaluate(FEED_STATE_JS)
+        if state["count"] > previous_count and saturation_check is not None:
+            batches += 1
+            saturated = saturation_check.batch(await page.evaluate(FEED_HREFS_JS, previous_count))
+
+    return state["count"]
+
+
+async def extract_all_business_urls(page: Page):
+    """returns the unique place URLs of the loaded search results, in feed order"""
+    hrefs = await page.locator(PLACE_LINKS_XPATH).evaluate_all("links => links.map(a => a.href)")
+    return list(dict.fromkeys(href for href in hrefs if href and "google.com/maps/place" in href))
+
+
+async def scrape_reviews(page: Page, business_name: str, output_dir: str = "output/reviews"):
+    """async port of review_scraper.scrape_reviews"""
+    os.makedirs(output_dir, exist_ok=True)
+    filename = f"{output_dir}/reviews_{sanitize_filename(business_name)}.csv"
+
+    try:
+        reviews_tab = page.locator("button[role='tab']:has-text('Reviews')")
+        if await reviews_tab.count() == 0:
+            print("⚠️ Reviews tab not found")
+            return filename
+        await reviews_tab.click()
+
+        try:
+            await page.wait_for_selector("div.jJc9Ad", timeout=12000)
+        except TimeoutError:
+            print("⚠️ No reviews loaded")
+            return filename
+
+        scrollable, _ = await SELECTORS.find_async(page, "reviews_container", has="div.jJc9Ad")
+        if scrollable is None:
+            scrollable = page.locator("body")
+
+        reviews = {}
+        no_change = 0
+        for _ in range(6):
+            new_count = 0
+            for review in await page.evaluate(REVIEWS_JS):
+                key = (review['reviewer_name'], review['customer_review'][:100], review['date'])
+                if key not in reviews:
+                    reviews[key] = review
+                    new_count += 1
+
+            no_change = no_change + 1 if new_count == 0 else 0
+            if no_change >= 2 or len(reviews) > 300:
+                break
+
+            await scrollable.evaluate("el => el.scrollTop = el.scrollHeight")
+            await page.wait_for_timeout(2000)
+
+        save_reviews(list(reviews.values()), filename)
+
+    except Exception as e:
+        print(f"❌ Error during async review scraping: {e}")
+
+    return filename
+
+
+async def scrape_images(page: Page, business_name: str, output_dir: str = "output/images"):
+    """async port of image_scraper.scrape_images"""
+    os.makedirs(output_dir, exist_ok=True)
+    filename = f"{output_dir}/images_{sanitize_filename(business_name)}.csv"
+
+    try:
+        photos_button, _ = await SELECTORS.find_async(page, "photos_button")
+        if photos_button is not None:
+            await photos_button.click()
+
+        try:
+            await page.wait_for_selector('div[role="img"], img[src*="googleusercontent.com"]', timeout=4000)
+        except TimeoutError:
+            pass
+
+        images = {}
+        no_change = 0
+        for _ in range(7):
+            new_count = 0
+            for image in await page.evaluate(IMAGES_JS):
+                if image['image_url'] not in images:
+                    images[image['image_url']] = image
+                    new_count += 1
+
+            no_change = no_change + 1 if new_count == 0 else 0
+            if no_change >= 2 or len(images) > 200:
+                break
+
+            await page.evaluate("window.scrollBy(0, 1500)")
+            await page.wait_for_timeout(1000)
+
+        save_images(list(images.values()), filename)
+        await page.keyboard.press("Escape")
+
+    except Exception as e:
+        print(f"❌ Error during async image scraping: {e}")
+
+    return filename
+
+
+class AsyncCrawler:
+    """drives the whole crawl on a single browser with bounded concurrency per stage"""
+
+    def __init__(self, browser, *, search_concurrency, detail_concurrency, enrichment_concurrency, journal,
+                 place_index, resume=False, fresh=False, listing_only=False, xhr_backend=False, xhr_fixtures=None,
+                 tile_planner=None, city_stats=None, min_new_rate=0.0, saturation_patience=2, persistent=False,
+                 review_workers=0, image_workers=0):
+        self.browser = browser
+        self.persistent = persistent
+        self.search_slots = asyncio.Semaphore(search_concurrency)
+        self.detail_slots = asyncio.Semaphore(detail_concurrency)
+        self.enrichment_slots = asyncio.Semaphore(enrichment_concurrency)
+        # Queued review/image stages (--enrichment-stage), started by crawl()
+        self.stage_workers = {"reviews": review_workers, "images": image_workers}
+        self.stage_queues = {}
+        self.stage_tasks = []
+        self.stage_order = itertools.count()
+        self.stage_done = {"reviews": 0, "images": 0}
+        self.journal = journal
+        self.listing_only = listing_only
+        self.listing_cards = {}
+        self.xhr_backend = xhr_backend and not listing_only
+        self.xhr_fixtures = xhr_fixtures
+        self.xhr_records = {}
+        self.tile_planner = tile_planner
+        self.city_stats = city_stats
+        self.min_new_rate = min_new_rate
+        self.saturation_patience = saturation_patience
+        self.early_stops = 0
+        self.scroll_cycles_saved = 0
+        # (state, city) -> when its first search got a slot, the start of its yield duration
+        self.city_started = {}
+        self.progress_writer = ProgressCsvWriter("all_usa_sod_farms_citywise_progress", resume)
+        self.place_index = place_index
+        self.all_scraped_urls = set() if fresh else place_index.load()
+        # Known places are revisited from their URLs (--refresh); the searches only scrape the new ones
+        self.all_scraped_urls.update(REFRESH.previous)
+        self.master_business_list = BusinessList()
+        self.completed_cities = set()
+        # Index of the first business found by this run's searches (after restored and revisited ones)
+        self.crawl_start_index = 0
+
+        if resume:
+            self.all_scraped_urls.update(canonical_place_id(url) for url in journal.scraped_urls())
+            self.master_business_list.business_list = [Business(**business) for business in journal.scraped_businesses()]
+            self.completed_cities = journal.completed_cities()
+            print(f"♻️ Resuming: {len(self.completed_cities)} cities completed, "
+                  f"{len(self.master_business_list.business_list)} businesses restored from {journal.path}")
+
+    async def open_page(self, phase):
+        """opens a page in its own context on the healthiest proxy, returns the page and its proxy.
+
+        On a persistent profile all pages share the one context (and its proxy and HTTP cache).
+        """
+        if self.persistent:
+            page = await self.browser.new_page()
+            await RESOURCE_BLOCKER.attach_async(page, phase)
+            return page, None
+
+        proxy = PROXY_POOL.acquire()
+        try:
+            page = await (self.browser.new_page(proxy=proxy) if proxy else self.browser.new_page())
+        except Exception:
+            PROXY_POOL.release(proxy)
+            raise
+        PROXY_POOL.bind(page.context, proxy)
+        try:
+            await RESOURCE_BLOCKER.attach_async(page, phase)
+        except Exception:
+            await self.close_page(page, proxy)
+            raise
+        return page, proxy
+
+    async def close_page(self, page, proxy):
+        """closes a page from open_page and gives back its proxy, no-op for a page that never opened"""
+        if page is None:
+            return
+        if not self.persistent:
+            PROXY_POOL.release(proxy, page.context)
+        try:
+            await page.close()
+        except Exception:
+            # The page (or its browser) is already gone
+            pass
+
+    async def search_city(self, state_name, city_name):
+        """loads the search results for a city (or geo tile) on its own page, returns the new place URLs
+        and the number of results the feed held"""
+        search_term = f"sod farms in {city_name}, {state_name}"
+        search_tile = parse_tile_label(city_name)
+        search_url = (search_tile.search_url() if search_tile is not None
+                      else f"https://www.google.com/maps/search/{quote_plus(search_term)}")
+        async with self.search_slots:
+            self.city_started.setdefault((state_name, city_name), time.time())
+            page, proxy = await self.open_page("search")
+            xhr_capture = None
+            if self.xhr_backend:
+                # One capture per search page, so it only ever holds this city's places
+                xhr_capture = XhrCapture(self.xhr_fixtures)
+                xhr_capture.attach_async(page)
+            try:
+                with METRICS.timer("search", state=state_name, city=city_name):
+                    await goto_async(page, search_url, timeout=60000)
+                    try:
+                        await page.wait_for_selector(PLACE_LINKS_XPATH, timeout=15000)
+                    except TimeoutError:
+                        # An empty feed may also be a block page
+                        await check_page_async(page)
+                        print(f"⚠️ No sod farms found in {city_name}, {state_name}")
+                        return [], 0
+
+                # Searches run concurrently, so every feed gets its own saturation check
+                saturation_check = None
+                splittable = self.tile_planner is not None and self.tile_planner.can_split(city_name)
+                if self.min_new_rate > 0 and not splittable:
+                    saturation_check = FeedSaturationCheck(self.all_scraped_urls, self.min_new_rate,
+                                                           self.saturation_patience)
+                with METRICS.timer("scroll", state=state_name, city=city_name):
+                    total_count = await scroll_to_load_all_results(page, saturation_check=saturation_check)
+                if saturation_check is not None:
+                    self.early_stops += saturation_check.early_stops
+                    self.scroll_cycles_saved += saturation_check.cycles_saved
+                print(f"✅ {total_count} sod farms found in {city_name}, {state_name}")
+                with METRICS.timer("url_extraction", state=state_name, city=city_name):
+                    if self.listing_only:
+                        listing_cards = {card["url"]: card for card in await page.evaluate(LISTING_CARDS_JS)}
+                        business_urls = list(listing_cards)
+                    else:
+                        business_urls = await extract_all_business_urls(page)
+            finally:
+                await self.close_page(page, proxy)
+
+        new_urls = [url for url in business_urls if claim_url(self.all_scraped_urls, url)]
+        METRICS.count("duplicates_skipped", len(business_urls) - len(new_urls))
+        if self.listing_only:
+            self.listing_cards.update((url, listing_cards[url]) for url in new_urls)
+        if xhr_capture is not None:
+            xhr_records = xhr_capture.records()
+            self.xhr_records.update(
+                (url, xhr_records[canonical_place_id(url)]) for url in new_urls if canonical_place_id(url) in xhr_records
+            )
+        return new_urls, total_count
+
+    async def scrape_business(self, url, state_name, city_name, attempt=0):
+        """scrapes one business (plus its reviews and images) on a dedicated page.
+
+        A block page closes that page and retries the business on a new one, which gets its own
+        context on whatever proxy is healthiest now.
+        """
+        blocked = None
+        async with self.detail_slots:
+            page, proxy = None, None
+            try:
+                page, proxy = await self.open_page("detail")
+                with METRICS.timer("detail"):
+                    await goto_async(page, url, timeout=30000)
+                    try:
+                        await page.wait_for_selector("//h1[contains(@class, 'DUwDvf')]", timeout=10000)
+                    except TimeoutError:
+                        await check_page_async(page)
+                        print(f"⚠️ Business details not loaded properly for URL: {url}")
+                        METRICS.count("businesses_failed")
+                        return None
+
+                    business = Business(state=state_name, city=city_name, google_maps_url=url)
+                    details = parse_business_details(
+                        await page.evaluate(BUSINESS_DETAILS_JS, [BUSINESS_DETAIL_XPATHS, REVIEWS_AVERAGE_XPATH])
+                    )
+                business.name = details["name"]
+                business.address = details["address"]
+                business.website = details["website"]
+                business.phone_number = details["phone_number"]
+                business.reviews_count = details["reviews_count"]
+                business.reviews_average = details["reviews_average"]
+
+                business.latitude, business.longitude = extract_coordinates_from_url(page.url)
+                business.category = details["category"] or extract_categories_from_url(page.url)
+
+                if self.route_enrichment(business):
+                    await self.scrape_reviews_and_images(page, business)
+
+                print(f"✅ Completed: {business.name or 'Unnamed Business'} [{city_name}, {state_name}]")
+                METRICS.count("businesses_scraped")
+                return business
+
+            except PageBlocked as e:
+                blocked = e
+            except Exception as e:
+                print(f'❌ Error processing business URL {url}: {e}')
+                METRICS.count("businesses_failed")
+                return None
+            finally:
+                await self.close_page(page, proxy)
+
+        # Retry outside the slot, so the retry queues up like any other business
+        if attempt < MAX_BLOCK_RETRIES:
+            print(f"🚫 {blocked} - retrying on a fresh page")
+            return await self.scrape_business(url, state_name, city_name, attempt + 1)
+        print(f"❌ Giving up on {url}: {blocked}")
+        METRICS.count("businesses_failed")
+        return None
+
+    def route_enrichment(self, business):
+        """skips unchanged places (--refresh) and queues the rest while the enrichment stages run;
+        True if the caller has to scrape the reviews and images inline"""
+        if not business.name:
+            return False
+        if not REFRESH.needs_enrichment(business):
+            print(f"♻️ {business.name} is unchanged since the last run - skipping reviews and images")
+            return False
+        if self.stage_queues:
+            self.queue_enrichment(business)
+            return False
+        return True
+
+    async def scrape_reviews_and_images(self, page, business):
+        """scrapes the reviews and images of the business whose detail page is open"""
+        async with self.enrichment_slots:
+            await RESOURCE_BLOCKER.set_phase_async(page, "reviews")
+            with METRICS.timer("reviews"):
+                await scrape_reviews(page, business.name)
+            overview_tab, _ = await SELECTORS.find_async(page, "overview_tab", visible=True)
+            if overview_tab is not None:
+                await overview_tab.click()
+            await RESOURCE_BLOCKER.set_phase_async(page, "photos")
+            with METRICS.timer("images"):
+                await scrape_images(page, business.name)
+
+    async def enrich_payload_business(self, business, attempt=0):
+        """reviews and images of a business built from a search payload, which never opened its detail page"""
+        if attempt == 0 and not self.route_enrichment(business):
+            return
+        blocked = None
+        async with self.detail_slots:
+            page, proxy = None, None
+            try:
+                page, proxy = await self.open_page("detail")
+                await goto_async(page, business.google_maps_url, timeout=30000)
+                try:
+                    await page.wait_for_selector("//h1[contains(@class, 'DUwDvf')]", timeout=10000)
+                except TimeoutError:
+                    await check_page_async(page)
+                    raise
+                await self.scrape_reviews_and_images(page, business)
+                return
+            except PageBlocked as e:
+                blocked = e
+            except Exception as e:
+                print(f"⚠️ Could not open {business.name} for its reviews and images: {e}")
+                return
+            finally:
+                await self.close_page(page, proxy)
+
+        if attempt < MAX_BLOCK_RETRIES:
+            print(f"🚫 {blocked} - retrying on a fresh page")
+            await self.enrich_payload_business(business, attempt + 1)
+        else:
+            print(f"❌ Giving up on the reviews and images of {business.name}: {blocked}")
+
+    def queue_enrichment(self, business):
+        """hands a scraped business to the review and image stages, most reviewed places first"""
+        for stage_queue in self.stage_queues.values():
+            stage_queue.put_nowait((-(business.reviews_count or 0), next(self.stage_order),
+                                    business.google_maps_url, business.name, 0))
+
+    async def enrichment_worker(self, stage):
+        """drains one stage queue: opens the place on its own page and scrapes its reviews or images.
+
+        A block page requeues the place, which then gets a fresh page like any other.
+        """
+        stage_queue = self.stage_queues[stage]
+        while True:
+            priority, order, url, name, attempt = await stage_queue.get()
+            page, proxy = None, None
+            try:
+                page, proxy = await self.open_page(stage if stage == "reviews" else "photos")
+                await goto_async(page, url, timeout=30000)
+                try:
+                    await page.wait_for_selector("//h1[contains(@class, 'DUwDvf')]", timeout=10000)
+                except TimeoutError:
+                    await check_page_async(page)
+                    raise
+                with METRICS.timer(stage):
+                    await (scrape_reviews if stage == "reviews" else scrape_images)(page, name)
+                self.stage_done[stage] += 1
+            except PageBlocked as blocked:
+                if attempt < MAX_BLOCK_RETRIES:
+                    print(f"🚫 {stage} stage: {blocked} - retrying {name} on a fresh page")
+                    stage_queue.put_nowait((priority, next(self.stage_order), url, name, attempt + 1))
+                else:
+                    print(f"❌ {stage} stage gave up on {name}: {blocked}")
+            except Exception as e:
+                print(f"❌ {stage} stage failed on {name}: {e}")
+            finally:
+                await self.close_page(page, proxy)
+                stage_queue.task_done()
+
+    def start_enrichment(self):
+        if not any(self.stage_workers.values()):
+            return
+        for stage, workers in self.stage_workers.items():
+            self.stage_queues[stage] = asyncio.PriorityQueue()
+            self.stage_tasks.extend(asyncio.create_task(self.enrichment_worker(stage)) for _ in range(workers))
+        print(f"🧵 Enrichment stages: {self.stage_workers['reviews']} review workers, "
+              f"{self.stage_workers['images']} image workers")
+
+    async def finish_enrichment(self):
+        """waits until both stage queues are drained, then stops their workers"""
+        if not self.stage_queues:
+            return
+        print(f"⏳ Waiting for the enrichment stages: "
+              f"{', '.join(f'{stage_queue.qsize()} {stage}' for stage, stage_queue in self.stage_queues.items())} queued")
+        for stage_queue in self.stage_queues.values():
+            await stage_queue.join()
+        for task in self.stage_tasks:
+            task.cancel()
+        await asyncio.gather(*self.stage_tasks, return_exceptions=True)
+        for stage, done in self.stage_done.items():
+            print(f"🧵 {stage}: {done} places done")
+        self.stage_queues = {}
+
+    async def business_from_payload(self, url, state_name, city_name):
+        record = self.xhr_records.pop(url, None)
+        if record is not None:
+            business = business_from_xhr_record(record, url, state_name, city_name)
+            await self.enrich_payload_business(business)
+            return business
+        return await self.scrape_business(url, state_name, city_name)
+
+    async def scrape_and_record(self, url, state_name, city_name):
+        """scrapes one place and journals (and indexes) it as soon as it is done, not when the whole city is"""
+        if self.xhr_backend:
+            # Places missing from the search payloads fall back to their detail page
+            business = await self.business_from_payload(url, state_name, city_name)
+        else:
+            business = await self.scrape_business(url, state_name, city_name)
+        record_place_result(url, state_name, city_name, business, self.journal, self.place_index)
+        return business
+
+    async def crawl_city(self, state_name, city_name):
+        """searches a city and scrapes all of its new businesses concurrently, in feed order"""
+        if (state_name, city_name) in self.completed_cities:
+            print(f"⏭️ {city_name}, {state_name} already completed in a previous run - skipping")
+            return []
+
+        self.journal.mark_city(state_name, city_name, "pending")
+        try:
+            for attempt in range(MAX_BLOCK_RETRIES + 1):
+                try:
+                    new_urls, total_count = await self.search_city(state_name, city_name)
+                    break
+                except PageBlocked as blocked:
+                    if attempt == MAX_BLOCK_RETRIES:
+                        raise
+                    print(f"🚫 {blocked} - searching {city_name}, {state_name} again on a fresh page")
+        except Exception as e:
+            # Leave the city pending so a resumed run retries it
+            print(f"❌ Error scraping {city_name}, {state_name}: {e}")
+            self.city_started.pop((state_name, city_name), None)
+            return []
+
+        quadrant_tasks = []
+        if self.tile_planner is not None:
+            self.tile_planner.record(city_name, total_count)
+            for quadrant in self.tile_planner.take_splits():
+                self.journal.mark_city(state_name, quadrant, "pending")
+                quadrant_tasks.append(asyncio.create_task(self.crawl_city(state_name, quadrant)))
+
+        if self.listing_only:
+            results = [business_from_listing_card(self.listing_cards.pop(url), state_name, city_name) for url in new_urls]
+            for url, business in zip(new_urls, results):
+                record_place_result(url, state_name, city_name, business, self.journal, self.place_index)
+        else:
+            results = await asyncio.gather(*(self.scrape_and_record(url, state_name, city_name) for url in new_urls))
+
+        businesses = [business for business in results if business]
+        self.journal.mark_city(state_name, city_name, "done", len(businesses))
+        city_start_time = self.city_started.pop((state_name, city_name), time.time())
+        if self.city_stats is not None:
+            # From the first search slot until the city's own places are done - not the queueing
+            # before it, nor its quadrants
+            self.city_stats.record(state_name, city_name, len(businesses), time.time() - city_start_time)
+            self.city_stats.save()
+        print(f"🎉 Completed {city_name}, {state_name}: {len(businesses)}/{len(new_urls)} sod farms scraped successfully")
+
+        # Quadrants of a saturated tile are reported together with their parent
+        for quadrant_task in quadrant_tasks:
+            businesses.extend(await quadrant_task)
+        return businesses
+
+    async def crawl(self, states_to_scrape):
+        """crawls all cities concurrently and appends the results to the master list in plan order"""
+        plan = [(state_name, city_name) for state_name, cities in states_to_scrape.items() for city_name in cities]
+        if self.tile_planner is not None:
+            # Quadrants split off in a previous run that never got searched
+            plan.extend(sorted((state_name, city_name) for state_name, city_name in self.journal.pending_cities()
+                               if state_name in states_to_scrape and parse_tile_label(city_name)
+                               and (state_name, city_name) not in plan))
+        self.start_enrichment()
+        await self.revisit_previous_places(states_to_scrape)
+        self.crawl_start_index = len(self.master_business_list.business_list)
+        city_tasks = [asyncio.create_task(self.crawl_city(state_name, city_name)) for state_name, city_name in plan]
+
+        # Await in plan order so results (and progress files) stay deterministic
+        for task in city_tasks:
+            businesses = await task
+            if businesses:
+                self.master_business_list.business_list.extend(businesses)
+                try:
+                    with METRICS.timer("save"):
+                        self.progress_writer.append(businesses)
+                    print(f"💾 Progress saved")
+                except Exception as e:
+                    print(f"⚠️ Error saving progress: {e}")
+            METRICS.write_prometheus()
+
+        self.progress_writer.close()
+        if self.min_new_rate > 0:
+            print(f"🛑 Early scroll stops: {self.early_stops} saturated feeds, ~{self.scroll_cycles_saved} scroll cycles saved")
+        return self.master_business_list
+
+    async def revisit_previous_places(self, states_to_scrape):
+        """--refresh: opens the previous records' places of the plan's states again, straight from their
+        URLs, so places that no longer rank in a search are refreshed too"""
+        previous = REFRESH.businesses(states_to_scrape)
+        if not previous:
+            return
+        print(f"♻️ Revisiting {len(previous)} places of previous runs")
+        start_index = len(self.master_business_list.business_list)
+        self.master_business_list.business_list.extend(previous)
+        await self.detail_pass(start_index)
+
+    async def detail_pass(self, start_index=0):
+        """second pass for --listing-only and xhr runs: replaces listing/payload records with fully scraped ones"""
+        businesses = self.master_business_list.business_list[start_index:]
+        print(f"\n🔎 DETAIL PASS: opening {len(businesses)} business pages...")
+        results = await asyncio.gather(*(
+            self.scrape_business(business.google_maps_url, business.state, business.city) for business in businesses
+        ))
+        for offset, detailed_business in enumerate(results):
+            if detailed_business:
+                self.master_business_list.business_list[start_index + offset] = detailed_business
+        print(f"✅ Detail pass complete: {sum(1 for result in results if result)}/{len(businesses)} businesses enriched")
+
+
+async def async_main():
+    parser = build_arg_parser()
+    parser.add_argument("--search-concurrency", type=int, default=2,
+                        help="Number of city searches running at the same time (default: 2)")
+    parser.add_argument("--enrichment-concurrency", type=int, default=4,
+                        help="Number of review/image passes running at the same time (default: 4)")
+    parser.set_defaults(detail_pages=8)
+    args = parser.parse_args()
+    if args.rank_cities is not None:
+        CityYieldStats(args.city_stats).print_ranking(args.rank_cities)
+        return
+    if not validate_args(args):
+        return
+    if args.workers > 1:
+        print("⚠️ --workers is ignored by the async engine, raise --detail-pages/--search-concurrency instead")
+
+    states_to_scrape = apply_yield_schedule(build_states_to_scrape(args), args)
+    total_states = len(states_to_scrape)
+    total_cities = sum(len(cities) for cities in states_to_scrape.values())
+    start_time = time.time()
+
+    print(f"\n🌟 STARTING ASYNC CITY-WISE SCRAPING:")
+    print(f"📊 Total states to process: {total_states}")
+    print(f"🏙️ Total cities to process: {total_cities}")
+    print(f"⚡ Concurrency: {args.search_concurrency} searches, {args.detail_pages} detail pages, "
+          f"{args.enrichment_concurrency} enrichment passes")
+    print(f"{'='*80}")
+
+    journal = CrawlJournal(args.journal, reset=not args.resume)
+    place_index = PlaceIndex(args.place_index)
+    if not args.resume:
+        # The places of an unfinished run aren't in any final file and its progress csv starts over
+        place_index.discard_pending()
+    RESOURCE_BLOCKER.enabled = not args.no_block_resources
+    configure_proxy_pool(args)
+    configure_refresh(args)
+    SELECTORS.load(args.selector_stats)
+    METRICS.configure("async", args.metrics_dir)
+
+    async with async_playwright() as p:
+        if args.profile_dir:
+            # One persistent context keeps the Maps app shell cached for every page
+            profile_dir = os.path.join(args.profile_dir, "async")
+            os.makedirs(profile_dir, exist_ok=True)
+            proxy = PROXY_POOL.acquire()
+            browser = await p.chromium.launch_persistent_context(profile_dir, headless=False, proxy=proxy)
+            PROXY_POOL.bind(browser, proxy)
+        else:
+            # Every page gets its own context and proxy from the pool
+            browser = await p.chromium.launch(headless=False)
+        crawler = AsyncCrawler(
+            browser,
+            search_concurrency=args.search_concurrency,
+            detail_concurrency=args.detail_pages,
+            enrichment_concurrency=args.enrichment_concurrency,
+            journal=journal,
+            place_index=place_index,
+            resume=args.resume,
+            fresh=args.fresh,
+            listing_only=args.listing_only,
+            xhr_backend=args.extraction_backend == "xhr",
+            xhr_fixtures=args.xhr_fixtures,
+            tile_planner=build_tile_planner(args),
+            city_stats=CityYieldStats(args.city_stats),
+            min_new_rate=args.min_new_rate,
+            saturation_patience=args.saturation_patience,
+            persistent=bool(args.profile_dir),
+            review_workers=args.review_workers if args.enrichment_stage else 0,
+            image_workers=args.image_workers if args.enrichment_stage else 0,
+        )
+        try:
+            master_business_list = await crawler.crawl(states_to_scrape)
+            if args.detail_pass:
+                await crawler.detail_pass(crawler.crawl_start_index)
+            await crawler.finish_enrichment()
+        finally:
+            await browser.close()
+            journal.close()
+
+    REFRESH.print_report()
+    SELECTORS.print_report()
+    SELECTORS.save()
+    print_proxy_report(PROXY_POOL.stats())
+    print_pacing_report(PACER.stats())
+    print_final_report(master_business_list, total_states, total_cities, time.time() - start_time,
+                       RESOURCE_BLOCKER.stats() if RESOURCE_BLOCKER.enabled else None, METRICS.snapshot(),
+                       args.export_formats)
+    print(f"🗂️ Place index: {place_index.commit()} new places added to {args.place_index}")
+    METRICS.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(async_main())
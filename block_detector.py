@@ -0,0 +1,101 @@
+"""Detects the pages Google serves instead of results: CAPTCHAs, the "unusual traffic" interstitial and consent walls.
+
+Once one of them shows up, every later navigation of that browser runs into it again, so
+callers get a PageBlocked exception right away and recycle the session onto a fresh
+browser and proxy instead of timing out on every remaining business.
+"""
+from urllib.parse import urlparse
+
+# How often a city or business is retried on a recycled session after hitting a block page
+MAX_BLOCK_RETRIES = 2
+
+BLOCK_STATE_JS = """
+() => {
+    if (document.querySelector('#captcha-form, form[action*="/sorry/"], iframe[src*="recaptcha"], div.g-recaptcha')) {
+        return 'captcha';
+    }
+    // The interstitial is a tiny page - don't scan the text of a full Maps page
+    const text = document.body ? document.body.textContent : '';
+    if (text.length < 20000 && /unusual traffic from your computer network/i.test(text)) {
+        return 'unusual_traffic';
+    }
+    if (document.querySelector('form[action*="consent.google"]')) {
+        return 'consent';
+    }
+    return null;
+}
+"""
+
+# Buttons of the consent wall, both accept and reject get the page through
+CONSENT_BUTTONS = ('form[action*="consent.google"] button, button[aria-label*="Accept all"], '
+                   'button[aria-label*="Reject all"]')
+
+
+class PageBlocked(Exception):
+    """Google served a block page (kind: captcha, unusual_traffic, consent or http_<status>) for url"""
+
+    def __init__(self, kind, url):
+        super().__init__(f"Google block page ({kind}) for {url}")
+        self.kind = kind
+        self.url = url
+
+
+def is_google_url(url):
+    """block detection only applies to Google pages, not to the business websites web_scraper.py visits"""
+    host = urlparse(url or "").hostname or ""
+    return host == "google.com" or host.startswith("google.") or ".google." in host
+
+
+def block_kind_from_url(url):
+    """the block pages that can be told from their URL alone"""
+    if "/sorry/" in (url or ""):
+        return "unusual_traffic"
+    if (urlparse(url or "").hostname or "").startswith("consent."):
+        return "consent"
+    return None
+
+
+def detect_block(page):
+    """returns the kind of block page the page shows (sync API), None for a regular page"""
+    if not is_google_url(page.url):
+        return None
+    kind = block_kind_from_url(page.url)
+    if kind:
+        return kind
+    try:
+        return page.evaluate(BLOCK_STATE_JS)
+    except Exception:
+        return None
+
+
+async def detect_block_async(page):
+    """returns the kind of block page the page shows (async API), None for a regular page"""
+    if not is_google_url(page.url):
+        return None
+    kind = block_kind_from_url(page.url)
+    if kind:
+        return kind
+    try:
+        return await page.evaluate(BLOCK_STATE_JS)
+    except Exception:
+        return None
+
+
+def dismiss_consent(page):
+    """clicks through a consent wall (sync API), returns True if the page is no longer blocked"""
+    try:
+        page.locator(CONSENT_BUTTONS).first.click(timeout=5000)
+        page.wait_for_load_state("domcontentloaded", timeout=10000)
+    except Exception:
+        return False
+    return detect_block(page) is None
+
+
+async def dismiss_consent_async(page):
+    """clicks through a consent wall (async API), returns True if the page is no longer blocked"""
+    try:
+        await page.locator(CONSENT_BUTTONS).first.click(timeout=5000)
+        await page.wait_for_load_state("domcontentloaded", timeout=10000)
+    except Exception:
+        return False
+    return await detect_block_async(page) is None
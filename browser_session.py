@@ -0,0 +1,75 @@
+"""Browser sessions bound to a proxy from the pool, which can be recycled onto another proxy"""
+from proxy_pool import PROXY_POOL
+import os
+from resource_blocker import RESOURCE_BLOCKER
+
+
+class BrowserSession:
+    """A browser with one context and page, going through the healthiest proxy of the pool.
+
+    recycle() closes everything and starts over on whatever proxy is healthiest now, e.g.
+    after the current one got tripped. The sync API is bound to one thread, so every
+    thread (and every DetailPagePool worker) owns its own session.
+
+    With a profile_dir the session runs on a persistent context instead: the HTTP cache
+    (the multi-megabyte Maps JS bundles and fonts) and the consent cookies survive across
+    pages, recycles and runs. Chromium locks a profile, so every session needs its own dir.
+    """
+
+    def __init__(self, playwright, headless=False, launch_options=None, context_options=None, block_resources=True,
+                 profile_dir=None):
+        self.playwright = playwright
+        self.headless = headless
+        self.launch_options = launch_options or {}
+        self.context_options = context_options or {}
+        self.block_resources = block_resources
+        self.profile_dir = profile_dir
+        self.proxy = None
+        self.browser = None
+        self.context = None
+        self.page = None
+
+    def open(self):
+        """launches the browser on the healthiest proxy, returns the page"""
+        self.proxy = PROXY_POOL.acquire()
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            self.context = self.playwright.chromium.launch_persistent_context(
+                self.profile_dir, headless=self.headless, proxy=self.proxy, **self.launch_options, **self.context_options
+            )
+            # A persistent context starts with a blank page already open
+            self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
+        else:
+            self.browser = self.playwright.chromium.launch(headless=self.headless, proxy=self.proxy,
+                                                           **self.launch_options)
+            self.context = self.browser.new_context(**self.context_options)
+            self.page = self.context.new_page()
+        PROXY_POOL.bind(self.context, self.proxy)
+        if self.block_resources:
+            RESOURCE_BLOCKER.attach(self.page)
+        return self.page
+
+    def close(self):
+        """closes the browser and gives the proxy back to the pool"""
+        try:
+            if self.browser is not None:
+                self.browser.close()
+            elif self.context is not None:
+                self.context.close()
+        except Exception:
+            pass
+        if self.context is not None:
+            PROXY_POOL.release(self.proxy, self.context)
+        self.browser, self.context, self.page = None, None, None
+
+    def recycle(self):
+        """starts over with a fresh browser on the healthiest proxy, returns the new page"""
+        print(f"♻️ Recycling browser session (was on {self.proxy['server'] if self.proxy else 'direct connection'})")
+        self.close()
+        return self.open()
+
+    @property
+    def proxy_tripped(self):
+        """True when the proxy of this session is cooling down and another one is available to move to;
+        with a single proxy, or all of them cooling down, a new browser would land on a tripped proxy anyway"""
+        return PROXY_POOL.is_tripped(self.proxy) and PROXY_POOL.has_alternative(self.proxy)
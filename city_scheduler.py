@@ -0,0 +1,102 @@
+"""Yield-aware city scheduling: remembers how many new places each city produced per minute.
+
+Every crawled city adds an observation to a persistent JSON stats file. Later runs (the
+weekly refreshes) can search the most productive cities first and skip the ones that keep
+coming back empty or all-duplicate, instead of giving every city the same treatment.
+"""
+import json
+import math
+import os
+
+# Weight of the newest observation in the expected yield, older runs fade out
+YIELD_SMOOTHING = 0.5
+
+
+def city_key(state_name, city_name):
+    return f"{state_name}|{city_name}"
+
+
+class CityYieldStats:
+    """Per-city yield history, stored as JSON at path.
+
+    Without a path the stats stay in memory; worker processes use that and hand their
+    observations to the parent, which is the only writer of the file.
+    """
+
+    def __init__(self, path="output/city_yield.json"):
+        self.path = path
+        self.cities = {}
+        self.observations = []
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.cities = json.load(f)
+
+    def record(self, state_name, city_name, new_places, seconds):
+        """adds the result of one city crawl: new unique places and the time it took"""
+        self.observations.append((state_name, city_name, new_places, seconds))
+        places_per_minute = new_places / (max(seconds, 1) / 60)
+
+        city = self.cities.setdefault(city_key(state_name, city_name), {
+            "runs": 0, "new_places": 0, "seconds": 0.0, "expected_yield": places_per_minute, "zero_runs": 0,
+        })
+        city["runs"] += 1
+        city["new_places"] += new_places
+        city["seconds"] += seconds
+        city["expected_yield"] = (YIELD_SMOOTHING * places_per_minute
+                                  + (1 - YIELD_SMOOTHING) * city["expected_yield"])
+        city["zero_runs"] = city["zero_runs"] + 1 if new_places == 0 else 0
+
+    def save(self):
+        """writes the stats file atomically, no-op for in-memory stats"""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cities, f, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def expected_yield(self, state_name, city_name):
+        """expected new places per minute, infinite for cities never crawled so they get explored first"""
+        city = self.cities.get(city_key(state_name, city_name))
+        return city["expected_yield"] if city else math.inf
+
+    def should_skip(self, state_name, city_name, min_yield=None, max_zero_runs=None):
+        """True for cities whose history says they aren't worth a search"""
+        city = self.cities.get(city_key(state_name, city_name))
+        if city is None:
+            return False
+        if max_zero_runs is not None and city["zero_runs"] >= max_zero_runs:
+            return True
+        return min_yield is not None and city["expected_yield"] < min_yield
+
+    def order_plan(self, states_to_scrape, min_yield=None, max_zero_runs=None):
+        """reorders the cities of every state by expected yield (best first), dropping skipped cities"""
+        ordered_plan = {}
+        skipped = 0
+        for state_name, cities in states_to_scrape.items():
+            kept = [city_name for city_name in cities
+                    if not self.should_skip(state_name, city_name, min_yield, max_zero_runs)]
+            skipped += len(cities) - len(kept)
+            kept.sort(key=lambda city_name: self.expected_yield(state_name, city_name), reverse=True)
+            ordered_plan[state_name] = tuple(kept)
+
+        print(f"📈 Yield schedule: cities ordered by expected new places per minute, {skipped} low-yield cities skipped")
+        return ordered_plan
+
+    def ranking(self):
+        """[(state, city, stats)] sorted by expected yield, best first"""
+        ranked = []
+        for key, city in self.cities.items():
+            state_name, city_name = key.split("|", 1)
+            ranked.append((state_name, city_name, city))
+        ranked.sort(key=lambda entry: entry[2]["expected_yield"], reverse=True)
+        return ranked
+
+    def print_ranking(self, limit=None):
+        ranked = self.ranking()
+        print(f"📈 CITY YIELD RANKING ({len(ranked)} cities with history in {self.path}):")
+        print(f"{'#':>4}  {'places/min':>10}  {'runs':>4}  {'zero':>4}  {'places':>6}  city")
+        for rank, (state_name, city_name, city) in enumerate(ranked[:limit] if limit else ranked, start=1):
+            print(f"{rank:>4}  {city['expected_yield']:>10.2f}  {city['runs']:>4}  {city['zero_runs']:>4}  "
+                  f"{city['new_places']:>6}  {city_name}, {state_name}")
@@ -0,0 +1,96 @@
+"""Durable SQLite journal of the city crawl, used by main.py --resume to pick up where a run stopped"""
+from dataclasses import asdict
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class CrawlJournal:
+    """Records the status of every city and every place URL of a crawl.
+
+    Cities go pending -> done, places go done/failed together with the scraped business,
+    so a resumed run can skip finished cities, rebuild the URL dedup set and restore the
+    business list without touching the browser. Safe to share between the threads of a
+    DetailPagePool; every worker process opens its own instance on the same file.
+    """
+
+    def __init__(self, path="output/crawl_journal.sqlite", reset=False):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cities (
+                state TEXT NOT NULL,
+                city TEXT NOT NULL,
+                status TEXT NOT NULL,
+                scraped_count INTEGER DEFAULT 0,
+                updated_at REAL,
+                PRIMARY KEY (state, city)
+            );
+            CREATE TABLE IF NOT EXISTS places (
+                url TEXT PRIMARY KEY,
+                state TEXT,
+                city TEXT,
+                status TEXT NOT NULL,
+                business TEXT,
+                updated_at REAL
+            );
+        """)
+
+        if reset:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM cities")
+                self._conn.execute("DELETE FROM places")
+
+    def mark_city(self, state_name, city_name, status, scraped_count=0):
+        """records the status ('pending' or 'done') of a city"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cities (state, city, status, scraped_count, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (state_name, city_name, status, scraped_count, time.time()),
+            )
+
+    def mark_place(self, url, state_name, city_name, status, business=None):
+        """records the status ('done' or 'failed') of a place URL, with the scraped business if any"""
+        business_json = json.dumps(asdict(business)) if business is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO places (url, state, city, status, business, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, state_name, city_name, status, business_json, time.time()),
+            )
+
+    def completed_cities(self):
+        """returns the set of (state, city) pairs that were fully processed"""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, city FROM cities WHERE status = 'done'").fetchall()
+        return {(state, city) for state, city in rows}
+
+    def pending_cities(self):
+        """returns the set of (state, city) pairs that were started or queued but not finished"""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, city FROM cities WHERE status = 'pending'").fetchall()
+        return {(state, city) for state, city in rows}
+
+    def scraped_urls(self):
+        """returns the place URLs that were scraped successfully (failed ones are retried on resume)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT url FROM places WHERE status = 'done'").fetchall()
+        return {url for (url,) in rows}
+
+    def scraped_businesses(self):
+        """returns the business records of all successfully scraped places, in scrape order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT business FROM places WHERE status = 'done' AND business IS NOT NULL ORDER BY rowid"
+            ).fetchall()
+        return [json.loads(business) for (business,) in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
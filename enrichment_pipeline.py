@@ -0,0 +1,197 @@
+"""Queued review and image stages, decoupled from the business detail scraping.
+
+With the pipeline running, scrape_business_from_url only extracts the core business data
+and queues the place; review and image workers pick places up from their own queues, on
+their own browsers, so the detail stage races ahead and each expensive stage scales with
+its own worker count. Within a stage, places with the most reviews go first (ties in the
+order they were found), so the valuable farms are enriched even if the run is cut short.
+"""
+from patchright.sync_api import sync_playwright
+from review_scraper import scrape_reviews
+from image_scraper import scrape_images
+from place_index import canonical_place_id
+from browser_session import BrowserSession
+from block_detector import MAX_BLOCK_RETRIES, PageBlocked
+from navigation import check_page, goto
+from resource_blocker import RESOURCE_BLOCKER
+from metrics import METRICS
+import itertools
+import math
+import os
+import queue
+import threading
+
+DETAIL_HEADING = "//h1[contains(@class, 'DUwDvf')]"
+
+
+def scrape_place_reviews(page, name):
+    RESOURCE_BLOCKER.set_phase(page, "reviews")
+    with METRICS.timer("reviews"):
+        scrape_reviews(page, name)
+
+
+def scrape_place_images(page, name):
+    RESOURCE_BLOCKER.set_phase(page, "photos")
+    with METRICS.timer("images"):
+        scrape_images(page, name)
+
+
+class EnrichmentStage:
+    """one queue of places and the worker threads that drain it, each with its own browser.
+
+    Once no worker is left (their browsers couldn't start), queued and later places are
+    counted as failed instead of waiting forever.
+    """
+
+    def __init__(self, name, scrape, workers, profile_dir=None):
+        self.name = name
+        self.scrape = scrape
+        self.profile_dir = profile_dir
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._queued = set()
+        self._lock = threading.Lock()
+        self.done = 0
+        self.failed = 0
+        self._alive = workers
+        self._threads = [threading.Thread(target=self._worker, args=(worker_index,), daemon=True)
+                         for worker_index in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, place_id, url, name, priority=0, attempt=0):
+        """queues a place, once per run - lower priority values go first"""
+        with self._lock:
+            if attempt == 0:
+                if place_id in self._queued:
+                    return
+                self._queued.add(place_id)
+            if self._alive == 0:
+                self.failed += 1
+                return
+            self._queue.put((priority, next(self._order), (place_id, url, name, attempt)))
+
+    def _worker(self, worker_index):
+        try:
+            self._run_worker(worker_index)
+        except Exception as e:
+            print(f"❌ {self.name}{worker_index + 1} died: {e}")
+            with self._lock:
+                self._alive -= 1
+                if self._alive == 0:
+                    self._fail_pending()
+
+    def _fail_pending(self):
+        """counts the queued places as failed once no worker is left to take them"""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self.failed += 1
+            self._queue.task_done()
+
+    def _run_worker(self, worker_index):
+        label = f"{self.name}{worker_index + 1}"
+        with sync_playwright() as p:
+            session = BrowserSession(p, profile_dir=os.path.join(self.profile_dir, label) if self.profile_dir else None)
+            page = None
+
+            while True:
+                priority, _, task = self._queue.get()
+                if task is None:
+                    self._queue.task_done()
+                    break
+
+                place_id, url, name, attempt = task
+                try:
+                    if page is not None and session.proxy_tripped:
+                        session.close()
+                        page = None
+                    if page is None:
+                        page = session.open()
+                    RESOURCE_BLOCKER.set_phase(page, "detail")
+                    goto(page, url, timeout=30000)
+                    try:
+                        page.wait_for_selector(DETAIL_HEADING, timeout=10000)
+                    except Exception:
+                        check_page(page)
+                        raise
+                    self.scrape(page, name)
+                    with self._lock:
+                        self.done += 1
+                except PageBlocked as blocked:
+                    print(f"🚫 {label}: {blocked} - recycling its browser")
+                    session.close()
+                    page = None
+                    if attempt < MAX_BLOCK_RETRIES:
+                        self.submit(place_id, url, name, priority, attempt + 1)
+                    else:
+                        with self._lock:
+                            self.failed += 1
+                except Exception as e:
+                    print(f"❌ {label} failed on {name}: {e}")
+                    with self._lock:
+                        self.failed += 1
+                    session.close()
+                    page = None
+                finally:
+                    self._queue.task_done()
+
+            session.close()
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def close(self):
+        """waits until the queue is drained, then stops the workers"""
+        self._queue.join()
+        for _ in self._threads:
+            self._queue.put((math.inf, next(self._order), None))
+        for thread in self._threads:
+            thread.join()
+
+
+class EnrichmentPipeline:
+    """Review and image stages fed with the places the detail stage scraped.
+
+    Not running until start(); scrape_business_from_url keeps scraping reviews and images
+    inline as long as it isn't.
+    """
+
+    def __init__(self):
+        self.stages = []
+
+    @property
+    def running(self):
+        return bool(self.stages)
+
+    def start(self, review_workers=1, image_workers=1, profile_dir=None):
+        self.stages = [
+            EnrichmentStage("reviews", scrape_place_reviews, review_workers, profile_dir),
+            EnrichmentStage("images", scrape_place_images, image_workers, profile_dir),
+        ]
+        print(f"🧵 Enrichment stages: {review_workers} review workers, {image_workers} image workers")
+
+    def submit(self, business):
+        """queues a scraped business for its reviews and images"""
+        if not business.name:
+            return
+        place_id = canonical_place_id(business.google_maps_url)
+        for stage in self.stages:
+            stage.submit(place_id, business.google_maps_url, business.name, -(business.reviews_count or 0))
+
+    def close(self):
+        """waits for both stages to drain and prints what they did"""
+        if not self.stages:
+            return
+        print(f"⏳ Waiting for the enrichment stages: "
+              f"{', '.join(f'{stage.pending()} {stage.name}' for stage in self.stages)} queued")
+        for stage in self.stages:
+            stage.close()
+            print(f"🧵 {stage.name}: {stage.done} places done, {stage.failed} failed")
+        self.stages = []
+
+
+# Pipeline shared by every detail worker of this process
+ENRICHMENT = EnrichmentPipeline()
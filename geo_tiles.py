@@ -0,0 +1,160 @@
+"""Geo-tile search plan: covers each state with map viewports instead of a list of city names.
+
+Every tile is searched with /maps/search/sod+farms/@lat,lng,zoomz, so Google ranks the
+results of that viewport - rural farms between cities included. A tile whose result
+list comes back saturated (the feed stops at ~120 places) is split into four quadrants
+one zoom level deeper, so dense metros get more searches and empty prairie just one.
+
+Tiles travel through the plan, the journal and the output as labels like
+"@31.2500,-85.5000,9z", in the slot a city name would otherwise take.
+"""
+from dataclasses import dataclass
+from urllib.parse import quote_plus
+import math
+import re
+
+TILE_SEARCH_TERM = "sod farms"
+
+# Approximate bounding box of every state: (south, west, north, east)
+STATE_BOUNDS = {
+    "Alabama": (30.14, -88.47, 35.01, -84.89),
+    "Alaska": (51.21, -179.15, 71.39, -129.98),
+    "Arizona": (31.33, -114.82, 37.00, -109.04),
+    "Arkansas": (33.00, -94.62, 36.50, -89.64),
+    "California": (32.53, -124.41, 42.01, -114.13),
+    "Colorado": (36.99, -109.06, 41.00, -102.04),
+    "Connecticut": (40.98, -73.73, 42.05, -71.79),
+    "Delaware": (38.45, -75.79, 39.84, -75.05),
+    "Florida": (24.52, -87.63, 31.00, -80.03),
+    "Georgia": (30.36, -85.61, 35.00, -80.84),
+    "Hawaii": (18.91, -160.25, 22.24, -154.81),
+    "Idaho": (41.99, -117.24, 49.00, -111.04),
+    "Illinois": (36.97, -91.51, 42.51, -87.50),
+    "Indiana": (37.77, -88.10, 41.76, -84.78),
+    "Iowa": (40.38, -96.64, 43.50, -90.14),
+    "Kansas": (36.99, -102.05, 40.00, -94.59),
+    "Kentucky": (36.50, -89.57, 39.15, -81.96),
+    "Louisiana": (28.93, -94.04, 33.02, -88.82),
+    "Maine": (43.06, -71.08, 47.46, -66.95),
+    "Maryland": (37.91, -79.49, 39.72, -75.05),
+    "Massachusetts": (41.24, -73.51, 42.89, -69.93),
+    "Michigan": (41.70, -90.42, 48.31, -82.41),
+    "Minnesota": (43.50, -97.24, 49.38, -89.49),
+    "Mississippi": (30.17, -91.66, 35.00, -88.10),
+    "Missouri": (35.99, -95.77, 40.61, -89.10),
+    "Montana": (44.36, -116.05, 49.00, -104.04),
+    "Nebraska": (40.00, -104.05, 43.00, -95.31),
+    "Nevada": (35.00, -120.01, 42.00, -114.04),
+    "New Hampshire": (42.70, -72.56, 45.31, -70.61),
+    "New Jersey": (38.93, -75.56, 41.36, -73.89),
+    "New Mexico": (31.33, -109.05, 37.00, -103.00),
+    "New York": (40.50, -79.76, 45.02, -71.86),
+    "North Carolina": (33.84, -84.32, 36.59, -75.46),
+    "North Dakota": (45.94, -104.05, 49.00, -96.55),
+    "Ohio": (38.40, -84.82, 41.98, -80.52),
+    "Oklahoma": (33.62, -103.00, 37.00, -94.43),
+    "Oregon": (41.99, -124.57, 46.29, -116.46),
+    "Pennsylvania": (39.72, -80.52, 42.27, -74.69),
+    "Rhode Island": (41.15, -71.91, 42.02, -71.12),
+    "South Carolina": (32.03, -83.35, 35.22, -78.54),
+    "South Dakota": (42.48, -104.06, 45.95, -96.44),
+    "Tennessee": (34.98, -90.31, 36.68, -81.65),
+    "Texas": (25.84, -106.65, 36.50, -93.51),
+    "Utah": (37.00, -114.05, 42.00, -109.04),
+    "Vermont": (42.73, -73.44, 45.02, -71.46),
+    "Virginia": (36.54, -83.68, 39.47, -75.24),
+    "Washington": (45.54, -124.85, 49.00, -116.92),
+    "West Virginia": (37.20, -82.64, 40.64, -77.72),
+    "Wisconsin": (42.49, -92.89, 47.31, -86.25),
+    "Wyoming": (40.99, -111.06, 45.01, -104.05),
+}
+
+# Width of the browser viewport in 256px map tiles, which sets how much ground a zoom level shows
+VIEWPORT_MAP_TILES = 4
+
+TILE_LABEL_PATTERN = re.compile(r'^@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?),(\d+)z$')
+
+
+def tile_span_degrees(zoom, latitude):
+    """(lat, lng) degrees covered by the viewport at a zoom level"""
+    lng_span = 360 / 2 ** zoom * VIEWPORT_MAP_TILES
+    return lng_span * math.cos(math.radians(latitude)), lng_span
+
+
+@dataclass(frozen=True)
+class SearchTile:
+    """map viewport searched in one go, centered on lat/lng"""
+    latitude: float
+    longitude: float
+    zoom: int
+
+    @property
+    def label(self):
+        return f"@{self.latitude:.4f},{self.longitude:.4f},{self.zoom}z"
+
+    def search_url(self, search_term=TILE_SEARCH_TERM):
+        return f"https://www.google.com/maps/search/{quote_plus(search_term)}/{self.label}"
+
+    def split(self):
+        """the four quadrant tiles one zoom level deeper"""
+        lat_span, lng_span = tile_span_degrees(self.zoom, self.latitude)
+        return [
+            SearchTile(round(self.latitude + lat_offset * lat_span / 4, 4),
+                       round(self.longitude + lng_offset * lng_span / 4, 4), self.zoom + 1)
+            for lat_offset in (1, -1) for lng_offset in (-1, 1)
+        ]
+
+
+def parse_tile_label(label):
+    """returns the SearchTile behind a plan label, or None for a regular city name"""
+    match = TILE_LABEL_PATTERN.match(label or "")
+    if not match:
+        return None
+    return SearchTile(float(match.group(1)), float(match.group(2)), int(match.group(3)))
+
+
+def tiles_for_state(state_name, zoom):
+    """grid of tiles covering the bounding box of a state, north-west to south-east"""
+    south, west, north, east = STATE_BOUNDS[state_name]
+    lat_span, lng_span = tile_span_degrees(zoom, (south + north) / 2)
+
+    rows = max(1, math.ceil((north - south) / lat_span))
+    cols = max(1, math.ceil((east - west) / lng_span))
+    return [
+        SearchTile(round(north - (row + 0.5) * (north - south) / rows, 4),
+                   round(west + (col + 0.5) * (east - west) / cols, 4), zoom)
+        for row in range(rows) for col in range(cols)
+    ]
+
+
+class TilePlanner:
+    """decides which searched tiles get subdivided, and hands the quadrants back to the crawl"""
+
+    def __init__(self, saturation=100, max_zoom=13):
+        self.saturation = saturation
+        self.max_zoom = max_zoom
+        self._splits = []
+        self.split_count = 0
+
+    def can_split(self, label):
+        """True for a tile that gets subdivided if its search comes back saturated - its feed has to be
+        scrolled to the end (no early saturation stop), or the result count would be cut short"""
+        tile = parse_tile_label(label)
+        return tile is not None and tile.zoom < self.max_zoom
+
+    def record(self, label, result_count):
+        """records how many results a searched tile returned, queueing its quadrants if saturated"""
+        tile = parse_tile_label(label)
+        if tile is None or result_count < self.saturation or tile.zoom >= self.max_zoom:
+            return []
+
+        quadrants = [quadrant.label for quadrant in tile.split()]
+        print(f"🧩 Tile {label} saturated ({result_count} results) - splitting into {len(quadrants)} quadrants")
+        self._splits.extend(quadrants)
+        self.split_count += 1
+        return quadrants
+
+    def take_splits(self):
+        """returns and forgets the quadrant labels queued since the last call"""
+        splits, self._splits = self._splits, []
+        return splits
@@ -1,5 +1,6 @@
 # image_scraper_ultra_fast.py
 from patchright.sync_api import Page, TimeoutError
+from selector_registry import SELECTORS
 import time
 import csv
 import os
@@ -45,140 +46,141 @@ def is_valid_image_url(url: str) -> bool:
     return not any(bad in url.lower() for bad in bad_patterns)
 
 
-def extract_all_images_single_pass(page: Page) -> list:
-    """ULTRA-FAST: Extract ALL images in a single JavaScript execution"""
-
-    # JavaScript code to extract ALL images at once
-    js_code = """
-    () => {
-        const images = [];
-        const seenUrls = new Set();
-
-        // Helper function to add image if valid
-        const addImage = (url, altText, originalUrl, width, height, sourceType) => {
-            if (!url || !url.startsWith('http') || seenUrls.has(url)) return;
-
-            // Skip small/UI images
-            const badPatterns = ['=s40', '=s60', '=w40', '=w60', '=h40', '=h60', 'icon', 'logo', 'avatar', '1x1', 'pixel'];
-            if (badPatterns.some(bad => url.toLowerCase().includes(bad))) return;
-
-            seenUrls.add(url);
-            images.push({
-                image_url: url,
-                alt_text: altText || '',
-                original_url: originalUrl || url,
-                width: width || '',
-                height: height || '',
-                source_type: sourceType
-            });
-        };
-
-        // Clean URL function
-        const cleanUrl = (url) => {
-            if (!url) return url;
-            return url.replace(/=w\\d+-h\\d+/g, '=w2000-h2000')
-                     .replace(/=s\\d+/g, '=s2000')
-                     .replace(/=c-[^&]*/g, '')
-                     .replace(/-k-no$/g, '');
-        };
-
-        // Extract background image URL
-        const extractBgUrl = (style) => {
-            if (!style) return '';
-            const match = style.match(/background-image:\\s*url\\(["\']?(.*?)["\']?\\)/);
-            return match ? match[1] : '';
-        };
-
-        // PRIORITY 1: Background images from div[role="img"]
-        const bgSelectors = [
-            'div[role="img"][style*="background-image"]',
-            'div.U39Pmb[role="img"]',
-            'div.Uf0tqf[style*="background-image"]',
-            'div[style*="background-image"][style*="googleusercontent"]',
-            'div[style*="background-image"][style*="gstatic"]',
-            'div[style*="background-image"][style*="ggpht"]'
-        ];
-
-        bgSelectors.forEach(selector => {
-            document.querySelectorAll(selector).forEach(el => {
-                const style = el.getAttribute('style');
-                if (style && style.includes('background-image')) {
-                    const bgUrl = extractBgUrl(style);
-                    if (bgUrl) {
-                        const cleanedUrl = cleanUrl(bgUrl);
-                        const widthMatch = style.match(/width:\\s*(\\d+)px/);
-                        const heightMatch = style.match(/height:\\s*(\\d+)px/);
-                        addImage(
-                            cleanedUrl,
-                            'Background image',
-                            bgUrl,
-                            widthMatch ? widthMatch[1] : '',
-                            heightMatch ? heightMatch[1] : '',
-                            'background-image'
-                        );
-
-                        // Check nested divs
-                        el.querySelectorAll('div[style*="background-image"]').forEach(child => {
-                            const childStyle = child.getAttribute('style');
-                            if (childStyle && childStyle.includes('background-image')) {
-                                const childBgUrl = extractBgUrl(childStyle);
-                                if (childBgUrl) {
-                                    const cleanedChildUrl = cleanUrl(childBgUrl);
-                                    const cWidthMatch = childStyle.match(/width:\\s*(\\d+)px/);
-                                    const cHeightMatch = childStyle.match(/height:\\s*(\\d+)px/);
-                                    addImage(
-                                        cleanedChildUrl,
-                                        'Nested background image',
-                                        childBgUrl,
-                                        cWidthMatch ? cWidthMatch[1] : '',
-                                        cHeightMatch ? cHeightMatch[1] : '',
-                                        'nested-background-image'
-                                    );
-                                }
-                            }
-                        });
-                    }
-                }
-            });
+# JavaScript code to extract ALL images at once
+IMAGES_JS = """
+() => {
+    const images = [];
+    const seenUrls = new Set();
+
+    // Helper function to add image if valid
+    const addImage = (url, altText, originalUrl, width, height, sourceType) => {
+        if (!url || !url.startsWith('http') || seenUrls.has(url)) return;
+
+        // Skip small/UI images
+        const badPatterns = ['=s40', '=s60', '=w40', '=w60', '=h40', '=h60', 'icon', 'logo', 'avatar', '1x1', 'pixel'];
+        if (badPatterns.some(bad => url.toLowerCase().includes(bad))) return;
+
+        seenUrls.add(url);
+        images.push({
+            image_url: url,
+            alt_text: altText || '',
+            original_url: originalUrl || url,
+            width: width || '',
+            height: height || '',
+            source_type: sourceType
         });
-
-        // PRIORITY 2: Regular img tags
-        const imgSelectors = [
-            'img[src*="googleusercontent.com"]',
-            'img[src*="gstatic.com"]',
-            'img[src*="ggpht.com"]',
-            'img[src^="https://lh"]',
-            'img.DaSXdd',
-            'img[data-src*="google"]',
-            'picture img',
-            '[role="img"] img',
-            'img[loading="lazy"]',
-            'img[alt*="photo" i]'
-        ];
-
-        imgSelectors.forEach(selector => {
-            document.querySelectorAll(selector).forEach(img => {
-                const src = img.src || img.getAttribute('data-src') || img.getAttribute('data-lazy-src');
-                if (src) {
-                    const cleanedUrl = cleanUrl(src);
+    };
+
+    // Clean URL function
+    const cleanUrl = (url) => {
+        if (!url) return url;
+        return url.replace(/=w\\d+-h\\d+/g, '=w2000-h2000')
+                 .replace(/=s\\d+/g, '=s2000')
+                 .replace(/=c-[^&]*/g, '')
+                 .replace(/-k-no$/g, '');
+    };
+
+    // Extract background image URL
+    const extractBgUrl = (style) => {
+        if (!style) return '';
+        const match = style.match(/background-image:\\s*url\\(["\']?(.*?)["\']?\\)/);
+        return match ? match[1] : '';
+    };
+
+    // PRIORITY 1: Background images from div[role="img"]
+    const bgSelectors = [
+        'div[role="img"][style*="background-image"]',
+        'div.U39Pmb[role="img"]',
+        'div.Uf0tqf[style*="background-image"]',
+        'div[style*="background-image"][style*="googleusercontent"]',
+        'div[style*="background-image"][style*="gstatic"]',
+        'div[style*="background-image"][style*="ggpht"]'
+    ];
+
+    bgSelectors.forEach(selector => {
+        document.querySelectorAll(selector).forEach(el => {
+            const style = el.getAttribute('style');
+            if (style && style.includes('background-image')) {
+                const bgUrl = extractBgUrl(style);
+                if (bgUrl) {
+                    const cleanedUrl = cleanUrl(bgUrl);
+                    const widthMatch = style.match(/width:\\s*(\\d+)px/);
+                    const heightMatch = style.match(/height:\\s*(\\d+)px/);
                     addImage(
                         cleanedUrl,
-                        img.alt || '',
-                        src,
-                        img.width || img.getAttribute('width') || '',
-                        img.height || img.getAttribute('height') || '',
-                        'img-tag'
+                        'Background image',
+                        bgUrl,
+                        widthMatch ? widthMatch[1] : '',
+                        heightMatch ? heightMatch[1] : '',
+                        'background-image'
                     );
+
+                    // Check nested divs
+                    el.querySelectorAll('div[style*="background-image"]').forEach(child => {
+                        const childStyle = child.getAttribute('style');
+                        if (childStyle && childStyle.includes('background-image')) {
+                            const childBgUrl = extractBgUrl(childStyle);
+                            if (childBgUrl) {
+                                const cleanedChildUrl = cleanUrl(childBgUrl);
+                                const cWidthMatch = childStyle.match(/width:\\s*(\\d+)px/);
+                                const cHeightMatch = childStyle.match(/height:\\s*(\\d+)px/);
+                                addImage(
+                                    cleanedChildUrl,
+                                    'Nested background image',
+                                    childBgUrl,
+                                    cWidthMatch ? cWidthMatch[1] : '',
+                                    cHeightMatch ? cHeightMatch[1] : '',
+                                    'nested-background-image'
+                                );
+                            }
+                        }
+                    });
                 }
-            });
+            }
+        });
+    });
+
+    // PRIORITY 2: Regular img tags
+    const imgSelectors = [
+        'img[src*="googleusercontent.com"]',
+        'img[src*="gstatic.com"]',
+        'img[src*="ggpht.com"]',
+        'img[src^="https://lh"]',
+        'img.DaSXdd',
+        'img[data-src*="google"]',
+        'picture img',
+        '[role="img"] img',
+        'img[loading="lazy"]',
+        'img[alt*="photo" i]'
+    ];
+
+    imgSelectors.forEach(selector => {
+        document.querySelectorAll(selector).forEach(img => {
+            const src = img.src || img.getAttribute('data-src') || img.getAttribute('data-lazy-src');
+            if (src) {
+                const cleanedUrl = cleanUrl(src);
+                addImage(
+                    cleanedUrl,
+                    img.alt || '',
+                    src,
+                    img.width || img.getAttribute('width') || '',
+                    img.height || img.getAttribute('height') || '',
+                    'img-tag'
+                );
+            }
         });
+    });
+
+    return images;
+}
+"""
 
-        return images;
-    }
-    """
+
+def extract_all_images_single_pass(page: Page) -> list:
+    """ULTRA-FAST: Extract ALL images in a single JavaScript execution"""
 
     try:
-        return page.evaluate(js_code)
+        return page.evaluate(IMAGES_JS)
     except Exception as e:
         print(f"⚠️ JavaScript extraction failed: {e}")
         return []
@@ -270,23 +272,9 @@ def scrape_images(page: Page, business_name: str, output_dir: str = "output/imag
         start_time = time.time()
 
         # Step 1: Quick photo button detection and click
-        photo_indicators = [
-            '[data-value="all_photos"]',
-            'button[data-carousel-index="0"]',
-            'button:has-text("photos")',
-            'button:has-text("Photo")',
-            '[role="button"]:has-text("Photo")'
-        ]
-
-        photos_button = None
-        for selector in photo_indicators:
-            button = page.locator(selector)
-            if button.count() > 0:
-                photos_button = button.first
-                print(f"✅ Found photos button: {selector}")
-                break
-
+        photos_button, selector = SELECTORS.find(page, "photos_button")
         if photos_button:
+            print(f"✅ Found photos button: {selector}")
             try:
                 photos_button.click()
                 print("📸 Clicked photos button")
@@ -315,45 +303,7 @@ def scrape_images(page: Page, business_name: str, output_dir: str = "output/imag
         print(f"📸 Total unique images: {len(image_urls)}")
 
         # Step 4: Quick save
-        if image_urls:
-            # Quick deduplication (should already be unique)
-            unique_images = []
-            final_seen = set()
-
-            for img_data in image_urls:
-                url = img_data["image_url"]
-                if url not in final_seen:
-                    final_seen.add(url)
-                    unique_images.append(img_data)
-
-            # Save to CSV
-            fieldnames = ["image_url", "alt_text", "original_url", "width", "height", "source_type"]
-            with open(filename, 'w', encoding='utf-8', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(unique_images)
-
-            print(f"✅ Saved {len(unique_images)} images to {filename}")
-
-            # Quick stats
-            sources = {}
-            source_types = {}
-            for img in unique_images:
-                domain = urlparse(img['image_url']).netloc
-                sources[domain] = sources.get(domain, 0) + 1
-                src_type = img.get('source_type', 'unknown')
-                source_types[src_type] = source_types.get(src_type, 0) + 1
-
-            print(f"📊 Top domains: {dict(list(sources.items())[:3])}")
-            print(f"📋 Source types: {source_types}")
-
-            # Sample URLs (first 3 only for speed)
-            print("\n🔗 Sample URLs:")
-            for i, img_data in enumerate(unique_images[:3]):
-                url = img_data['image_url'][:50] + "..." if len(img_data['image_url']) > 50 else img_data['image_url']
-                print(f"   {i + 1}. [{img_data.get('source_type', 'unknown')}] {url}")
-
-        else:
+        if not save_images(image_urls, filename):
             print("❌ No images extracted")
             # Minimal debugging
             debug_count = page.locator('div[role="img"]').count()
@@ -370,4 +320,49 @@ def scrape_images(page: Page, business_name: str, output_dir: str = "output/imag
         import traceback
         traceback.print_exc()
 
-    return filename
\ No newline at end of file
+    return filename
+
+
+def save_images(image_urls: list, filename: str) -> list:
+    """Deduplicates the collected images and saves them to csv, returns the unique images"""
+    if not image_urls:
+        return []
+
+    # Quick deduplication (should already be unique)
+    unique_images = []
+    final_seen = set()
+
+    for img_data in image_urls:
+        url = img_data["image_url"]
+        if url not in final_seen:
+            final_seen.add(url)
+            unique_images.append(img_data)
+
+    # Save to CSV
+    fieldnames = ["image_url", "alt_text", "original_url", "width", "height", "source_type"]
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(unique_images)
+
+    print(f"✅ Saved {len(unique_images)} images to {filename}")
+
+    # Quick stats
+    sources = {}
+    source_types = {}
+    for img in unique_images:
+        domain = urlparse(img['image_url']).netloc
+        sources[domain] = sources.get(domain, 0) + 1
+        src_type = img.get('source_type', 'unknown')
+        source_types[src_type] = source_types.get(src_type, 0) + 1
+
+    print(f"📊 Top domains: {dict(list(sources.items())[:3])}")
+    print(f"📋 Source types: {source_types}")
+
+    # Sample URLs (first 3 only for speed)
+    print("\n🔗 Sample URLs:")
+    for i, img_data in enumerate(unique_images[:3]):
+        url = img_data['image_url'][:50] + "..." if len(img_data['image_url']) > 50 else img_data['image_url']
+        print(f"   {i + 1}. [{img_data.get('source_type', 'unknown')}] {url}")
+
+    return unique_images
@@ -0,0 +1,232 @@
+"""Parses the JSON payloads the Google Maps SPA loads search results and places from.
+
+The search feed is filled from /search?tbm=map responses and a place page from
+/maps/preview/place responses. Both are JSON arrays behind the )]}' anti-hijacking prefix,
+sometimes wrapped in a {"c":0,"d":"..."} envelope whose "d" holds the prefixed payload
+as a string. Place records are positional arrays; the parse functions below are pure so
+they can be checked against saved response fixtures:
+
+    python maps_xhr_parser.py output/xhr_fixtures/*.json
+"""
+from urllib.parse import quote_plus
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+XSSI_PREFIX = ")]}'"
+
+# Responses carrying place data
+XHR_URL_MARKERS = ("tbm=map", "/maps/preview/place")
+
+# 0x89c25a3...:0x6b6b5... - same feature id as the !1s token of a place URL
+FEATURE_ID_PATTERN = re.compile(r'^0x[0-9a-fA-F]+:0x[0-9a-fA-F]+$')
+
+# Positions inside a place record
+PLACE_FIELDS = {
+    "feature_id": (10,),
+    "name": (11,),
+    "address": (39,),
+    "address_parts": (2,),
+    "reviews_average": (4, 7),
+    "reviews_count": (4, 8),
+    "website": (7, 0),
+    "phone_number": (178, 0, 0),
+    "latitude": (9, 2),
+    "longitude": (9, 3),
+    "categories": (13,),
+}
+
+
+def strip_xssi(text: str) -> str:
+    """removes the )]}' prefix and the {"c":0,"d":...} envelope, returns the bare JSON text"""
+    text = text.strip()
+    if text.startswith("{"):
+        try:
+            envelope = json.loads(text.removesuffix('/*""*/'))
+        except ValueError:
+            envelope = None
+        if isinstance(envelope, dict) and isinstance(envelope.get("d"), str):
+            text = envelope["d"].strip()
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    return text.strip()
+
+
+def load_payload(text: str):
+    """decodes a raw response body, returns None if it isn't a JSON payload"""
+    try:
+        return json.loads(strip_xssi(text))
+    except ValueError:
+        return None
+
+
+def dig(data, path):
+    """follows a path of list indexes, returns None as soon as a step is missing"""
+    for index in path:
+        if not isinstance(data, list) or index >= len(data):
+            return None
+        data = data[index]
+    return data
+
+
+def is_place_record(node) -> bool:
+    """a place record is a long list with the feature id at [10] and the name at [11]"""
+    return (
+        isinstance(node, list)
+        and len(node) > 11
+        and isinstance(node[10], str)
+        and FEATURE_ID_PATTERN.match(node[10]) is not None
+        and isinstance(node[11], str)
+        and bool(node[11])
+    )
+
+
+def find_place_records(payload, max_depth=8):
+    """walks the payload and returns every place record in document order.
+
+    The records sit at different depths in search and place responses (and move around
+    between Maps releases), so they are recognised by shape instead of a fixed path.
+    """
+    records = []
+    stack = [(payload, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if is_place_record(node):
+            records.append(node)
+            continue
+        if isinstance(node, list) and depth < max_depth:
+            stack.extend((child, depth + 1) for child in reversed(node))
+    return records
+
+
+def place_url(feature_id: str, name: str) -> str:
+    """a place URL whose data= token canonicalises to the feature id, like the feed links do"""
+    return f"https://www.google.com/maps/place/{quote_plus(name)}/data=!4m2!3m1!1s{feature_id}"
+
+
+def parse_place_record(record) -> dict:
+    """turns a positional place record into a dict with the Business field names"""
+    values = {name: dig(record, path) for name, path in PLACE_FIELDS.items()}
+
+    address = values["address"] if isinstance(values["address"], str) else None
+    if not address and isinstance(values["address_parts"], list):
+        address = ", ".join(part for part in values["address_parts"] if isinstance(part, str)) or None
+
+    categories = values["categories"] if isinstance(values["categories"], list) else []
+    categories = [category for category in categories if isinstance(category, str)]
+
+    def number(value, kind):
+        return kind(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+    def text(value):
+        return value if isinstance(value, str) and value else None
+
+    feature_id = values["feature_id"].lower()
+    return {
+        "place_id": feature_id,
+        "name": values["name"],
+        "address": address,
+        "website": text(values["website"]),
+        "phone_number": text(values["phone_number"]),
+        "reviews_count": number(values["reviews_count"], int),
+        "reviews_average": number(values["reviews_average"], float),
+        "latitude": number(values["latitude"], float),
+        "longitude": number(values["longitude"], float),
+        "category": categories[0] if categories else None,
+        "google_maps_url": place_url(feature_id, values["name"]),
+    }
+
+
+def parse_places(text: str) -> list:
+    """parses a search or place response body into place dicts, [] if nothing could be parsed"""
+    payload = load_payload(text)
+    if payload is None:
+        return []
+
+    places = []
+    for record in find_place_records(payload):
+        try:
+            places.append(parse_place_record(record))
+        except Exception as e:
+            print(f"⚠️ Could not parse place record: {e}")
+    return places
+
+
+class XhrCapture:
+    """Collects the place payloads a page receives, keyed by canonical place id.
+
+    Attach it once to the search page; clear() it before each city so records() only
+    holds the places of the current search.
+    """
+
+    def __init__(self, fixtures_dir=None):
+        self.fixtures_dir = fixtures_dir
+        self._lock = threading.Lock()
+        self._places = {}
+        self.responses = 0
+        self.parse_failures = 0
+        if fixtures_dir:
+            os.makedirs(fixtures_dir, exist_ok=True)
+
+    def attach(self, page):
+        """starts capturing on a page (sync API)"""
+        page.on("response", self._on_response)
+
+    def attach_async(self, page):
+        """starts capturing on a page (async API)"""
+        page.on("response", self._on_response_async)
+
+    def _on_response(self, response):
+        if not any(marker in response.url for marker in XHR_URL_MARKERS):
+            return
+        try:
+            body = response.text()
+        except Exception:
+            return
+        self.add_body(body)
+
+    async def _on_response_async(self, response):
+        if not any(marker in response.url for marker in XHR_URL_MARKERS):
+            return
+        try:
+            body = await response.text()
+        except Exception:
+            return
+        self.add_body(body)
+
+    def add_body(self, body: str):
+        """parses one response body and keeps its places"""
+        if self.fixtures_dir:
+            path = os.path.join(self.fixtures_dir, f"xhr_{time.time_ns()}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(body)
+
+        places = parse_places(body)
+        with self._lock:
+            self.responses += 1
+            if not places:
+                self.parse_failures += 1
+            for place in places:
+                self._places.setdefault(place["place_id"], place)
+        return places
+
+    def records(self) -> dict:
+        with self._lock:
+            return dict(self._places)
+
+    def clear(self):
+        with self._lock:
+            self._places.clear()
+
+
+if __name__ == "__main__":
+    for fixture_path in sys.argv[1:]:
+        with open(fixture_path, encoding='utf-8') as fixture:
+            fixture_places = parse_places(fixture.read())
+        print(f"📄 {fixture_path}: {len(fixture_places)} places")
+        for fixture_place in fixture_places:
+            print(f"   🏢 {fixture_place['name']} | {fixture_place['address']} | {fixture_place['phone_number']} | "
+                  f"{fixture_place['reviews_average']} ({fixture_place['reviews_count']}) | {fixture_place['place_id']}")
@@ -0,0 +1,138 @@
+"""Per-phase timings and counters of a crawl, exported as JSONL events and a Prometheus textfile.
+
+Phases: search, scroll, url_extraction, detail, reviews, images, save and enrichment.
+Every timed phase and every counter increment is appended to <dir>/events_<process>.jsonl
+as it happens; the aggregated totals are rewritten to <dir>/sod_scraper_<process>.prom,
+which node_exporter's textfile collector can scrape. Each worker process exports under its
+own process label, so the files never clash.
+"""
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+
+PHASES = ("search", "scroll", "url_extraction", "detail", "reviews", "images", "save", "enrichment")
+
+
+class Metrics:
+    """Thread-safe recorder of phase timings and counters"""
+
+    def __init__(self, process="main", directory=None):
+        self._lock = threading.Lock()
+        self._events = None
+        self.configure(process, directory)
+
+    def configure(self, process="main", directory=None):
+        """sets the process label and the export directory (None keeps everything in memory)"""
+        with self._lock:
+            if self._events is not None:
+                self._events.close()
+                self._events = None
+            self.process = process
+            self.directory = directory
+            self.phase_seconds = {}
+            self.phase_runs = {}
+            self.counters = {}
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+                self._events = open(os.path.join(directory, f"events_{process}.jsonl"), 'a', encoding='utf-8')
+
+    def _emit(self, event):
+        if self._events is not None:
+            self._events.write(json.dumps(event) + "\n")
+            self._events.flush()
+
+    def observe(self, phase, seconds, **labels):
+        """records one run of a phase that took `seconds`"""
+        with self._lock:
+            self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+            self.phase_runs[phase] = self.phase_runs.get(phase, 0) + 1
+            self._emit({"ts": time.time(), "process": self.process, "type": "timer", "phase": phase,
+                        "seconds": round(seconds, 4), **labels})
+
+    @contextmanager
+    def timer(self, phase, **labels):
+        """times the enclosed block as one run of `phase`, also when it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - started, **labels)
+
+    def count(self, name, value=1, **labels):
+        """adds value to a counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+            self._emit({"ts": time.time(), "process": self.process, "type": "counter", "name": name,
+                        "value": value, **labels})
+
+    def prometheus_text(self):
+        """the aggregated metrics in the Prometheus text exposition format"""
+        with self._lock:
+            process = self.process
+            lines = [
+                "# HELP sod_scraper_phase_duration_seconds Time spent per scraping phase.",
+                "# TYPE sod_scraper_phase_duration_seconds summary",
+            ]
+            for phase in sorted(self.phase_seconds):
+                lines.append(f'sod_scraper_phase_duration_seconds_sum{{process="{process}",phase="{phase}"}} '
+                             f'{self.phase_seconds[phase]:.4f}')
+                lines.append(f'sod_scraper_phase_duration_seconds_count{{process="{process}",phase="{phase}"}} '
+                             f'{self.phase_runs[phase]}')
+            for name in sorted(self.counters):
+                lines.append(f"# TYPE sod_scraper_{name}_total counter")
+                lines.append(f'sod_scraper_{name}_total{{process="{process}"}} {self.counters[name]}')
+            lines.append("# TYPE sod_scraper_last_export_timestamp_seconds gauge")
+            lines.append(f'sod_scraper_last_export_timestamp_seconds{{process="{process}"}} {time.time():.0f}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self):
+        """rewrites the textfile atomically, so node_exporter never reads a half-written file"""
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, f"sod_scraper_{self.process}.prom")
+        text = self.prometheus_text()
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(f"{path}.tmp", path)
+
+    def snapshot(self):
+        """picklable totals, so worker processes can send theirs to the parent"""
+        with self._lock:
+            return {"phase_seconds": dict(self.phase_seconds), "phase_runs": dict(self.phase_runs),
+                    "counters": dict(self.counters)}
+
+    def close(self):
+        self.write_prometheus()
+        with self._lock:
+            if self._events is not None:
+                self._events.close()
+                self._events = None
+
+
+def merge_snapshots(snapshots):
+    """adds up the totals of several processes"""
+    merged = {"phase_seconds": {}, "phase_runs": {}, "counters": {}}
+    for snapshot in snapshots:
+        for section, values in snapshot.items():
+            for key, value in values.items():
+                merged[section][key] = merged[section].get(key, 0) + value
+    return merged
+
+
+def print_phase_report(snapshot):
+    """prints where the time went, phase by phase"""
+    total = sum(snapshot["phase_seconds"].values())
+    if not total:
+        return
+    print(f"⏱️ Phase breakdown ({total:.1f}s timed):")
+    for phase in sorted(snapshot["phase_seconds"], key=snapshot["phase_seconds"].get, reverse=True):
+        seconds, runs = snapshot["phase_seconds"][phase], snapshot["phase_runs"][phase]
+        print(f"   ⏱️ {phase:<15} {seconds:>9.1f}s  {seconds / total:>5.1%}  {runs:>6} runs  {seconds / runs:>6.2f}s avg")
+    for name, value in sorted(snapshot["counters"].items()):
+        print(f"   🔢 {name}: {value}")
+
+
+# Recorder shared by every thread of this process
+METRICS = Metrics()
@@ -0,0 +1,123 @@
+"""Single entry point for page navigations, so every goto is paced, feeds the proxy health scores
+and stops at Google's block pages"""
+from proxy_pool import PROXY_POOL
+from pacing import PACER
+from metrics import METRICS
+from block_detector import (
+    PageBlocked, block_kind_from_url, detect_block, detect_block_async, dismiss_consent, dismiss_consent_async,
+    is_google_url,
+)
+import time
+
+# Status codes that mean the proxy (not the site) is being refused
+BLOCK_STATUSES = (403, 429)
+
+
+def navigation_outcome(response, final_url):
+    """(ok, blocked) for a finished navigation.
+
+    Only Google pages count as blocked or failed: a 403/429 or 5xx from a business website is
+    that site refusing or failing the page, which says nothing about the proxy and isn't charged to it.
+    """
+    status = response.status if response is not None else None
+    google = is_google_url(final_url)
+    blocked = google and ("/sorry/" in final_url or status in BLOCK_STATUSES)
+    ok = not blocked and (status is None or status < 500 or not google)
+    return ok, blocked
+
+
+def pace(page):
+    """waits for the pacer of the page's proxy - for navigations that don't go through goto (searchbox searches)"""
+    PACER.wait(PROXY_POOL.proxy_for(page))
+
+
+def report(page, ok, latency=None, blocked=False):
+    """feeds the outcome of a navigation to the proxy pool and the pacer"""
+    proxy = PROXY_POOL.proxy_for(page)
+    PROXY_POOL.report(proxy, ok, latency, blocked)
+    PACER.record(proxy, ok, latency, blocked)
+
+
+def record_block(page, kind):
+    """reports a block page against the proxy and logs the event"""
+    print(f"🚫 Google block page ({kind}): {page.url[:100]}")
+    METRICS.count("blocks", kind=kind)
+    report(page, ok=False, blocked=True)
+
+
+def check_page(page):
+    """raises PageBlocked if the page shows a CAPTCHA, the unusual traffic page or a consent wall
+    that can't be clicked through (sync API)"""
+    kind = detect_block(page)
+    if kind == "consent" and dismiss_consent(page):
+        print("🍪 Consent wall accepted")
+        return
+    if kind:
+        record_block(page, kind)
+        raise PageBlocked(kind, page.url)
+
+
+async def check_page_async(page):
+    """raises PageBlocked if the page shows a CAPTCHA, the unusual traffic page or a consent wall
+    that can't be clicked through (async API)"""
+    kind = await detect_block_async(page)
+    if kind == "consent" and await dismiss_consent_async(page):
+        print("🍪 Consent wall accepted")
+        return
+    if kind:
+        record_block(page, kind)
+        raise PageBlocked(kind, page.url)
+
+
+def goto(page, url, **kwargs):
+    """page.goto (sync API), paced per proxy, that reports latency, errors and blocks.
+
+    Raises PageBlocked when Google answers with a block page instead of the requested one.
+    """
+    pace(page)
+    started = time.monotonic()
+    try:
+        response = page.goto(url, **kwargs)
+    except Exception:
+        # A business website that times out or refuses the connection isn't the proxy's fault
+        if is_google_url(url):
+            report(page, ok=False)
+        raise
+
+    ok, blocked = navigation_outcome(response, page.url)
+    if blocked:
+        kind = block_kind_from_url(page.url) or f"http_{response.status}"
+        record_block(page, kind)
+        raise PageBlocked(kind, page.url)
+    if is_google_url(url) or is_google_url(page.url):
+        report(page, ok, time.monotonic() - started, blocked)
+    if ok:
+        check_page(page)
+    return response
+
+
+async def goto_async(page, url, **kwargs):
+    """page.goto (async API), paced per proxy, that reports latency, errors and blocks.
+
+    Raises PageBlocked when Google answers with a block page instead of the requested one.
+    """
+    await PACER.wait_async(PROXY_POOL.proxy_for(page))
+    started = time.monotonic()
+    try:
+        response = await page.goto(url, **kwargs)
+    except Exception:
+        # A business website that times out or refuses the connection isn't the proxy's fault
+        if is_google_url(url):
+            report(page, ok=False)
+        raise
+
+    ok, blocked = navigation_outcome(response, page.url)
+    if blocked:
+        kind = block_kind_from_url(page.url) or f"http_{response.status}"
+        record_block(page, kind)
+        raise PageBlocked(kind, page.url)
+    if is_google_url(url) or is_google_url(page.url):
+        report(page, ok, time.monotonic() - started, blocked)
+    if ok:
+        await check_page_async(page)
+    return response
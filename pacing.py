@@ -0,0 +1,125 @@
+"""Adaptive pacing of navigations: one token bucket per proxy instead of fixed sleeps.
+
+Every navigation takes a token from the bucket of the proxy it goes through and waits
+when the bucket is empty. The refill rate adapts to what the navigations report back
+(additive increase, multiplicative decrease): fast successes raise it step by step,
+slow responses and errors lower it, and a block halves it and drains the burst, so a
+proxy Google starts refusing backs off at once while a responsive one isn't held back.
+"""
+import asyncio
+import threading
+import time
+
+# Bucket key of navigations without a proxy
+DIRECT = "direct"
+
+
+class TokenBucket:
+    """token bucket whose refill rate (tokens per second) can change at any time"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.navigations = 0
+        self.waited = 0.0
+
+    def reserve(self):
+        """takes a token, returns how long the caller has to wait for it (0 if one was available)"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # Tokens may go negative: concurrent callers queue up behind each other's reservations
+        self.tokens -= 1
+        delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        self.navigations += 1
+        self.waited += delay
+        return delay
+
+
+class Pacer:
+    """Per-proxy navigation rate limiter that adapts to latency, errors and blocks.
+
+    With enabled off (offline replays) navigations never wait.
+    """
+
+    def __init__(self, rate=1.0, min_rate=0.05, max_rate=2.0, burst=3, latency_target=5.0):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self.enabled = True
+        self.configure(rate, min_rate, max_rate, burst, latency_target)
+
+    def configure(self, rate=1.0, min_rate=0.05, max_rate=2.0, burst=3, latency_target=5.0):
+        """sets the starting rate (navigations per second per proxy), its bounds and the latency target"""
+        with self._lock:
+            self.rate = rate
+            self.min_rate = min_rate
+            self.max_rate = max_rate
+            self.burst = burst
+            self.latency_target = latency_target
+            self._buckets.clear()
+
+    def _bucket(self, proxy):
+        key = proxy["server"] if proxy else DIRECT
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def delay(self, proxy):
+        """reserves a navigation through a proxy, returns the seconds to wait before starting it"""
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            return self._bucket(proxy).reserve()
+
+    def wait(self, proxy):
+        """blocks until a navigation through the proxy may start (sync API)"""
+        delay = self.delay(proxy)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, proxy):
+        """waits until a navigation through the proxy may start (async API)"""
+        delay = self.delay(proxy)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, proxy, ok, latency=None, blocked=False):
+        """adapts the rate of a proxy to the outcome of one navigation"""
+        with self._lock:
+            bucket = self._bucket(proxy)
+            if blocked:
+                bucket.rate *= 0.5
+                bucket.tokens = min(bucket.tokens, 0)
+            elif not ok:
+                bucket.rate *= 0.75
+            elif latency is not None and latency > self.latency_target:
+                bucket.rate *= 0.9
+            else:
+                bucket.rate += 0.05
+            bucket.rate = min(max(bucket.rate, self.min_rate), self.max_rate)
+
+    def stats(self):
+        """per-proxy rate and waiting time for the end-of-run report"""
+        with self._lock:
+            return [
+                {"proxy": key, "rate": bucket.rate, "navigations": bucket.navigations, "waited": bucket.waited}
+                for key, bucket in self._buckets.items()
+            ]
+
+
+def print_pacing_report(stats):
+    """prints the final rate and the time spent waiting for every proxy"""
+    if not stats:
+        return
+    print(f"🚦 Pacing: {sum(bucket['navigations'] for bucket in stats)} navigations, "
+          f"{sum(bucket['waited'] for bucket in stats):.0f}s waited")
+    for bucket in stats:
+        print(f"   🚦 {bucket['proxy']}: {bucket['navigations']} navigations, {bucket['waited']:.0f}s waited, "
+              f"final rate {bucket['rate'] * 60:.0f}/min")
+
+
+# Pacer shared by every browser of this process
+PACER = Pacer()
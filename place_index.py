@@ -0,0 +1,104 @@
+"""Canonical Google Maps place IDs and a persistent index of the places already scraped"""
+from urllib.parse import unquote, urlparse, parse_qs
+import os
+import re
+import threading
+
+# !1s0x89c25a3...:0x6b6b5... - feature id of the place inside the data= token
+FEATURE_ID_PATTERN = re.compile(r'!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)')
+# !16s%2Fg%2F11c5... - knowledge graph id, present on most place URLs
+KNOWLEDGE_GRAPH_ID_PATTERN = re.compile(r'!16s((?:%2F|/)[^!?&#]+)')
+
+
+def canonical_place_id(url: str) -> str:
+    """Reduces a Google Maps place URL to the stable identifier of the place.
+
+    The same farm found from two neighboring cities gets URLs with different search
+    coordinates and query fragments, but the same feature id in the data= token.
+    Falls back to the knowledge graph id, the ftid/cid query parameters and finally the
+    URL path without coordinates and query.
+    """
+    if not url:
+        return url
+
+    match = FEATURE_ID_PATTERN.search(url)
+    if match:
+        return match.group(1).lower()
+
+    match = KNOWLEDGE_GRAPH_ID_PATTERN.search(url)
+    if match:
+        return unquote(match.group(1))
+
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    if "ftid" in query:
+        return query["ftid"][0].lower()
+    if "cid" in query:
+        return f"cid:{query['cid'][0]}"
+
+    path = parsed.path.split('/@')[0].split('/data=')[0].rstrip('/')
+    return f"{parsed.netloc}{unquote(path)}"
+
+
+class PlaceIndex:
+    """Append-only file of canonical place IDs that were scraped, shared across runs.
+
+    The places of a running crawl go to a pending file next to the index and are moved into
+    the index only once the run's final files are written (commit()). A crashed run leaves
+    them pending: --resume keeps them (its journal and progress csv hold the businesses),
+    a new run discards them and scrapes those places again.
+
+    Every worker process opens its own instance on the same files; each batch of ids is
+    written with a single append so concurrent writers don't interleave lines.
+    """
+
+    def __init__(self, path="output/place_index.txt"):
+        self.path = path
+        self.pending_path = f"{path}.pending"
+        self._lock = threading.Lock()
+        self._indexed = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def _read(self, path):
+        if not os.path.exists(path):
+            return set()
+        with open(path, encoding='utf-8') as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def load(self):
+        """returns the set of all place IDs recorded so far, pending ones included"""
+        place_ids = self._read(self.path) | self._read(self.pending_path)
+        with self._lock:
+            self._indexed = set(place_ids)
+        return place_ids
+
+    def add(self, place_ids):
+        """records scraped place IDs as pending, skipping the ones already indexed"""
+        with self._lock:
+            if self._indexed is None:
+                self._indexed = self._read(self.path) | self._read(self.pending_path)
+            new_ids = list(dict.fromkeys(place_id for place_id in place_ids if place_id not in self._indexed))
+            if not new_ids:
+                return
+            self._indexed.update(new_ids)
+            with open(self.pending_path, 'a', encoding='utf-8') as f:
+                f.write("".join(f"{place_id}\n" for place_id in new_ids))
+
+    def commit(self):
+        """moves the pending place IDs into the index, once the run's final files are written"""
+        with self._lock:
+            committed = self._read(self.path)
+            new_ids = sorted(self._read(self.pending_path) - committed)
+            if new_ids:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write("".join(f"{place_id}\n" for place_id in new_ids))
+            if os.path.exists(self.pending_path):
+                os.remove(self.pending_path)
+        return len(new_ids)
+
+    def discard_pending(self):
+        """forgets the place IDs of an unfinished run, so a new run scrapes those places again"""
+        with self._lock:
+            self._indexed = None
+            if os.path.exists(self.pending_path):
+                os.remove(self.pending_path)
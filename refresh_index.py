@@ -0,0 +1,90 @@
+"""Incremental refresh: the businesses of all previous runs keyed by place, to skip unchanged farms.
+
+With the place index on, a run's final CSV only holds the places that were new in that run,
+so the previous records are merged from every final CSV (the newest record of a place wins).
+In --refresh mode every known place is revisited straight from its URL, but only for the
+cheap detail extraction, while the searches only scrape places nobody has seen yet. When
+none of the tracked fields moved since the last visit (same review count, rating, contact
+data...) its reviews and images can't have changed much either, so the review pane and the
+photo gallery - by far the slowest part of a business - are skipped.
+"""
+from place_index import canonical_place_id
+from metrics import METRICS
+import glob
+import os
+import threading
+
+# Fields whose change means the reviews and images are worth scraping again
+TRACKED_FIELDS = ("name", "address", "website", "phone_number", "reviews_count", "reviews_average", "category")
+
+FINAL_OUTPUT_PATTERN = "all_usa_sod_farms_citywise_complete_*.csv"
+
+
+def previous_outputs(save_at="output"):
+    """paths of the final CSVs of all previous runs, oldest first (the file names end in a timestamp)"""
+    return sorted(glob.glob(os.path.join(save_at, FINAL_OUTPUT_PATTERN)))
+
+
+class RefreshIndex:
+    """Previous records by canonical place ID, and the tally of what the refresh skipped"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.previous = {}
+        self.source = None
+        self.unchanged = 0
+        self.changed = 0
+        self.new = 0
+        self.reviews_skipped = 0
+
+    @property
+    def enabled(self):
+        return self.source is not None
+
+    def load(self, businesses, source):
+        """indexes the businesses of previous runs (read from source) by place, later records win"""
+        self.previous = {canonical_place_id(business.google_maps_url): business
+                         for business in businesses if business.google_maps_url}
+        self.source = source
+        print(f"♻️ Refresh mode: {len(self.previous)} places from {source}")
+
+    def businesses(self, states):
+        """the previous records in the given states, to be revisited from their URLs"""
+        return [business for business in self.previous.values() if business.state in states]
+
+    def changed_fields(self, business):
+        """tracked fields that differ from the previous run, None for a place that wasn't there"""
+        previous = self.previous.get(canonical_place_id(business.google_maps_url))
+        if previous is None:
+            return None
+        return [name for name in TRACKED_FIELDS if getattr(previous, name) != getattr(business, name)]
+
+    def needs_enrichment(self, business):
+        """True if the reviews and images of a freshly extracted business should be scraped (again)"""
+        if not self.enabled:
+            return True
+
+        changed = self.changed_fields(business)
+        with self._lock:
+            if changed is None:
+                self.new += 1
+            elif changed:
+                self.changed += 1
+            else:
+                self.unchanged += 1
+                self.reviews_skipped += business.reviews_count or 0
+        METRICS.count("refresh_new" if changed is None else "refresh_changed" if changed else "refresh_unchanged")
+        if changed:
+            print(f"♻️ Changed since the last run: {', '.join(changed)}")
+        return changed is None or bool(changed)
+
+    def print_report(self):
+        if not self.enabled:
+            return
+        revisited = self.unchanged + self.changed + self.new
+        print(f"♻️ Refresh: {revisited} places revisited - {self.unchanged} unchanged (reviews and images skipped, "
+              f"~{self.reviews_skipped} reviews not scrolled), {self.changed} changed, {self.new} new")
+
+
+# Previous records of this process
+REFRESH = RefreshIndex()
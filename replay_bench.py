@@ -0,0 +1,309 @@
+"""Offline replay benchmark for the Maps extraction code.
+
+Records a search feed and place pages once, then replays them without any network so
+extraction changes can be checked for speed and correctness without touching Google:
+
+    python replay_bench.py record --search "sod farms in Tifton, Georgia" \\
+        --place "https://www.google.com/maps/place/..." --fixtures bench_fixtures
+    python replay_bench.py replay --fixtures bench_fixtures --runs 3
+
+Feed and place scenarios are recorded as HAR files and replayed through route_from_har,
+which aborts every request the HAR doesn't hold. The review pane and photo gallery are
+stored as frozen HTML snapshots (scripts removed) served through page.route. Every
+scenario keeps the result of the live run as its expected output; replay runs headless
+and exits with status 1 when a scenario falls below --min-recall, so it can gate CI
+(tests/fixtures/replay holds a feed, a place page and its review and photo snapshots for that).
+Place replays time the detail extraction alone; reviews and images have their own scenarios.
+"""
+from patchright.sync_api import sync_playwright
+from main import enhanced_scroll_to_load_all_results, extract_all_business_urls, scrape_business_from_url
+from review_scraper import extract_all_reviews_single_pass, scrape_reviews
+from image_scraper import extract_all_images_single_pass
+from place_index import canonical_place_id
+from browser_session import BrowserSession
+from navigation import goto
+from block_detector import PageBlocked
+from proxy_pool import PROXY_POOL
+from pacing import PACER
+from dataclasses import asdict
+from urllib.parse import quote_plus
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+MANIFEST = "manifest.json"
+
+# Snapshots are served from this origin, which never resolves, so nothing leaks to the network
+SNAPSHOT_ORIGIN = "https://replay.invalid"
+
+SCRIPT_TAG_PATTERN = re.compile(r'<script\b[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+
+# Fields of a scraped business compared against the recording
+BUSINESS_FIELDS = ("name", "address", "website", "phone_number", "reviews_count", "reviews_average",
+                   "latitude", "longitude", "category")
+
+
+def review_key(review):
+    return "|".join(str(review.get(part)) for part in ("reviewer_name", "customer_review", "date"))
+
+
+def image_key(image):
+    return image["image_url"]
+
+
+def freeze_html(html):
+    """strips the scripts so the snapshot renders the DOM exactly as it was recorded"""
+    return SCRIPT_TAG_PATTERN.sub("", html)
+
+
+def recall(expected, actual):
+    """share of the expected items found again, 1.0 when nothing was expected"""
+    if not expected:
+        return 1.0
+    return len(set(expected) & set(actual)) / len(set(expected))
+
+
+def business_match(expected, business):
+    """share of the recorded business fields reproduced by the replay"""
+    if business is None:
+        return 0.0
+    actual = asdict(business)
+    return sum(1 for name in BUSINESS_FIELDS if actual.get(name) == expected.get(name)) / len(BUSINESS_FIELDS)
+
+
+class FixtureStore:
+    """Directory of HAR files, HTML snapshots and the manifest describing the scenarios"""
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self.path = os.path.join(self.directory, MANIFEST)
+        self.scenarios = []
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                self.scenarios = json.load(f)["scenarios"]
+
+    def file(self, name):
+        return os.path.join(self.directory, name)
+
+    def add(self, scenario):
+        self.scenarios = [existing for existing in self.scenarios if existing["name"] != scenario["name"]]
+        self.scenarios.append(scenario)
+
+    def write_snapshot(self, name, html):
+        with open(self.file(name), 'w', encoding='utf-8') as f:
+            f.write(freeze_html(html))
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"), "scenarios": self.scenarios}, f, indent=1)
+
+
+def record_feed(playwright, store, index, search, headless):
+    """records one search feed: scrolled to the end, with the place URLs it listed"""
+    name = f"feed_{index}"
+    har = f"{name}.har"
+    url = f"https://www.google.com/maps/search/{quote_plus(search)}"
+
+    session = BrowserSession(playwright, headless=headless, block_resources=False)
+    page = session.open()
+    try:
+        session.context.route_from_har(store.file(har), update=True, update_content="embed", update_mode="full")
+        # enhanced_scroll_to_load_all_results waits for the first listings itself
+        goto(page, url, timeout=60000)
+        count = enhanced_scroll_to_load_all_results(page)
+        place_ids = sorted({canonical_place_id(place_url) for place_url in extract_all_business_urls(page)})
+    finally:
+        # The HAR is written when its context closes
+        session.close()
+
+    store.add({"name": name, "kind": "feed", "url": url, "har": har,
+               "expected": {"count": count, "place_ids": place_ids}})
+    print(f"📼 Recorded {name}: {count} listings, {len(place_ids)} places")
+
+
+def record_place(playwright, store, index, url, headless):
+    """records a place page (HAR) plus snapshots of its review pane and photo gallery"""
+    name = f"place_{index}"
+    har = f"{name}.har"
+
+    session = BrowserSession(playwright, headless=headless, block_resources=False)
+    page = session.open()
+    try:
+        session.context.route_from_har(store.file(har), update=True, update_content="embed", update_mode="full")
+        business = scrape_business_from_url(page, url, "", "", 0, 1)
+        if business is None:
+            print(f"⚠️ Could not scrape {url}, nothing recorded")
+            return
+        store.add({"name": name, "kind": "place", "url": url, "har": har,
+                   "expected": {field_name: getattr(business, field_name) for field_name in BUSINESS_FIELDS}})
+
+        # scrape_business_from_url leaves the photo gallery open
+        images = extract_all_images_single_pass(page)
+        store.write_snapshot(f"{name}_images.html", page.content())
+        store.add({"name": f"{name}_images", "kind": "images", "html": f"{name}_images.html",
+                   "expected": {"keys": sorted({image_key(image) for image in images})}})
+
+        # Reopen the place and stop with the review pane scrolled out
+        goto(page, url, timeout=30000)
+        page.wait_for_selector("//h1[contains(@class, 'DUwDvf')]", timeout=10000)
+        scrape_reviews(page, business.name, tempfile.mkdtemp())
+        reviews = extract_all_reviews_single_pass(page)
+        store.write_snapshot(f"{name}_reviews.html", page.content())
+        store.add({"name": f"{name}_reviews", "kind": "reviews", "html": f"{name}_reviews.html",
+                   "expected": {"keys": sorted({review_key(review) for review in reviews})}})
+    finally:
+        session.close()
+
+    print(f"📼 Recorded {name}: {business.name}, {len(reviews)} reviews, {len(images)} images")
+
+
+def open_replay_page(browser, store, scenario):
+    """a page that can only see the recording of a scenario"""
+    context = browser.new_context()
+    if "har" in scenario:
+        context.route_from_har(store.file(scenario["har"]), not_found="abort")
+    else:
+        with open(store.file(scenario["html"]), encoding='utf-8') as f:
+            html = f.read()
+        context.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html", body=html)
+                      if route.request.url.startswith(SNAPSHOT_ORIGIN) else route.abort())
+    return context, context.new_page()
+
+
+def replay_scenario(browser, store, scenario, runs):
+    """runs one scenario `runs` times, returns (seconds per run, items per run, correctness)"""
+    expected = scenario["expected"]
+    kind = scenario["kind"]
+    seconds, items, scores = [], 0, []
+
+    if kind in ("reviews", "images"):
+        extract, key = ((extract_all_reviews_single_pass, review_key) if kind == "reviews"
+                        else (extract_all_images_single_pass, image_key))
+        context, page = open_replay_page(browser, store, scenario)
+        try:
+            page.goto(f"{SNAPSHOT_ORIGIN}/{scenario['html']}")
+            for _ in range(runs):
+                started = time.perf_counter()
+                extracted = extract(page)
+                seconds.append(time.perf_counter() - started)
+                items = len(extracted)
+                scores.append(recall(expected["keys"], [key(item) for item in extracted]))
+        finally:
+            context.close()
+        return seconds, items, min(scores)
+
+    for _ in range(runs):
+        context, page = open_replay_page(browser, store, scenario)
+        try:
+            started = time.perf_counter()
+            if kind == "feed":
+                try:
+                    page.goto(scenario["url"], timeout=60000)
+                    enhanced_scroll_to_load_all_results(page)
+                    place_ids = {canonical_place_id(place_url) for place_url in extract_all_business_urls(page)}
+                except Exception as e:
+                    print(f"⚠️ Replay of {scenario['name']} failed: {e}")
+                    place_ids = set()
+                seconds.append(time.perf_counter() - started)
+                items = len(place_ids)
+                scores.append(recall(expected["place_ids"], place_ids))
+            else:
+                try:
+                    # Only the detail extraction - reviews and images have their own scenarios
+                    business = scrape_business_from_url(page, scenario["url"], "", "", 0, 1, enrich=False)
+                except PageBlocked as e:
+                    print(f"⚠️ Replay of {scenario['name']} failed: {e}")
+                    business = None
+                seconds.append(time.perf_counter() - started)
+                items = 1 if business else 0
+                scores.append(business_match(expected, business))
+        finally:
+            context.close()
+    return seconds, items, min(scores)
+
+
+def record(args):
+    store = FixtureStore(args.fixtures)
+    os.makedirs(store.directory, exist_ok=True)
+    # Keep the review/image CSVs of the recording runs out of output/
+    os.chdir(tempfile.mkdtemp(prefix="replay_bench_"))
+    with sync_playwright() as p:
+        for index, search in enumerate(args.search):
+            record_feed(p, store, index, search, args.headless)
+        for index, url in enumerate(args.place):
+            record_place(p, store, index, url, args.headless)
+    store.save()
+    print(f"💾 {len(store.scenarios)} scenarios saved to {store.path}")
+
+
+def replay(args):
+    store = FixtureStore(args.fixtures)
+    scenarios = [scenario for scenario in store.scenarios if not args.only or scenario["kind"] in args.only]
+    if not scenarios:
+        print(f"❌ No scenarios in {store.path} - record some first")
+        return 1
+
+    # Replays never go through a proxy nor wait for the pacer (its sleeps would count as extraction
+    # time), and the scrapers' CSV output lands in a throwaway directory
+    PROXY_POOL.configure([])
+    PACER.enabled = False
+    os.chdir(tempfile.mkdtemp(prefix="replay_bench_"))
+
+    results = []
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=not args.headed)
+        try:
+            for scenario in scenarios:
+                print(f"\n▶️ Replaying {scenario['name']} ({scenario['kind']}) x{args.runs}")
+                results.append((scenario, *replay_scenario(browser, store, scenario, args.runs)))
+        finally:
+            browser.close()
+
+    failed = 0
+    print(f"\n{'='*80}\n📊 REPLAY BENCHMARK ({args.runs} runs per scenario)")
+    print(f"{'scenario':<22} {'kind':<8} {'mean s':>8} {'best s':>8} {'items':>6} {'items/s':>9} {'correct':>8}")
+    for scenario, seconds, items, correctness in results:
+        mean = sum(seconds) / len(seconds)
+        ok = correctness >= args.min_recall
+        failed += not ok
+        print(f"{scenario['name']:<22} {scenario['kind']:<8} {mean:>8.3f} {min(seconds):>8.3f} {items:>6} "
+              f"{items / mean if mean else 0:>9.1f} {correctness:>7.0%} {'✅' if ok else '❌'}")
+    print(f"{'='*80}")
+    return 1 if failed else 0
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Record Google Maps fixtures once, benchmark the extractors offline")
+    parser.add_argument("--fixtures", type=str, default="bench_fixtures",
+                        help="Directory of the recorded HAR files, snapshots and manifest (default: bench_fixtures)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Record scenarios from live Google Maps")
+    record_parser.add_argument("--headless", action="store_true", help="Run the recording browser headless")
+    record_parser.add_argument("--search", action="append", default=[],
+                               help="Search term whose result feed is recorded (repeatable)")
+    record_parser.add_argument("--place", action="append", default=[],
+                               help="Place URL whose page, review pane and photo gallery are recorded (repeatable)")
+
+    replay_parser = commands.add_parser("replay", help="Benchmark the extractors against the recordings, offline")
+    replay_parser.add_argument("--runs", type=int, default=3, help="Runs per scenario (default: 3)")
+    replay_parser.add_argument("--headed", action="store_true",
+                               help="Show the replay browser (headless by default, so replays run without a display)")
+    replay_parser.add_argument("--only", nargs="+", choices=["feed", "place", "reviews", "images"],
+                               help="Only replay scenarios of these kinds")
+    replay_parser.add_argument("--min-recall", type=float, default=0.95,
+                               help="Share of the recorded output a replay must reproduce to pass (default: 0.95)")
+    return parser
+
+
+if __name__ == "__main__":
+    cli_args = build_arg_parser().parse_args()
+    if cli_args.command == "record":
+        record(cli_args)
+    else:
+        sys.exit(replay(cli_args))
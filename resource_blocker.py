@@ -0,0 +1,186 @@
+"""Per-phase network resource blocking, so the paid proxy only carries what the current scraping phase needs.
+
+Blocking is done with Chromium's Network.setBlockedURLs over CDP rather than page.route():
+there is no Python round trip per request and the HTTP cache stays enabled. Blocked
+requests fail with net::ERR_BLOCKED_BY_CLIENT, which is what the byte accounting counts.
+"""
+from fnmatch import fnmatchcase
+import threading
+
+# URL patterns (CDP wildcard syntax) for each category of resource we may not need
+RESOURCE_PATTERNS = {
+    "tiles": ["*/maps/vt*", "*/kh/v=*", "*khms*.google.com/*", "*streetviewpixels*"],
+    "fonts": ["*fonts.gstatic.com/*", "*.woff2*", "*.woff?*", "*.ttf*"],
+    "photos": ["*googleusercontent.com/*", "*ggpht.com/*"],
+    "telemetry": ["*/gen_204*", "*/log?*", "*play.google.com/log*", "*/csi?*", "*google-analytics.com/*",
+                  "*googletagmanager.com/*"],
+}
+
+# Which categories each scraping phase blocks - the photo phase opts back in to photos
+PHASE_PROFILES = {
+    "search": ("tiles", "fonts", "photos", "telemetry"),
+    "detail": ("tiles", "fonts", "photos", "telemetry"),
+    "reviews": ("tiles", "fonts", "photos", "telemetry"),
+    "photos": ("tiles", "fonts", "telemetry"),
+}
+
+# Typical transfer size per category, used until real sizes have been observed
+DEFAULT_RESOURCE_BYTES = {
+    "tiles": 30_000,
+    "fonts": 25_000,
+    "photos": 60_000,
+    "telemetry": 1_000,
+}
+
+
+def categorize_url(url: str):
+    """returns the resource category of a url, or None if it is not a blockable resource"""
+    for category, patterns in RESOURCE_PATTERNS.items():
+        if any(fnmatchcase(url, pattern) for pattern in patterns):
+            return category
+    return None
+
+
+def blocked_patterns_for_phase(phase):
+    return [pattern for category in PHASE_PROFILES.get(phase, ()) for pattern in RESOURCE_PATTERNS[category]]
+
+
+class ResourceBlocker:
+    """Switches the blocked URL patterns of attached pages per phase and counts the bytes saved"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._sessions = {}  # page -> CDP session
+        self._phases = {}  # page -> current phase
+        self.blocked_counts = {category: 0 for category in RESOURCE_PATTERNS}
+        self.observed_bytes = {category: 0 for category in RESOURCE_PATTERNS}
+        self.observed_counts = {category: 0 for category in RESOURCE_PATTERNS}
+        self.transferred_bytes = 0
+
+    def attach(self, page, phase="search"):
+        """enables blocking on a page (sync API)"""
+        if not self.enabled:
+            return
+        try:
+            session = page.context.new_cdp_session(page)
+            session.send("Network.enable")
+        except Exception as e:
+            print(f"⚠️ Resource blocking unavailable: {e}")
+            return
+
+        self._sessions[page] = session
+        page.on("requestfailed", self._on_request_failed)
+        page.on("response", self._on_response)
+        page.on("close", lambda closed_page: self._forget(closed_page))
+        self.set_phase(page, phase)
+
+    async def attach_async(self, page, phase="search"):
+        """enables blocking on a page (async API)"""
+        if not self.enabled:
+            return
+        try:
+            session = await page.context.new_cdp_session(page)
+            await session.send("Network.enable")
+        except Exception as e:
+            print(f"⚠️ Resource blocking unavailable: {e}")
+            return
+
+        self._sessions[page] = session
+        page.on("requestfailed", self._on_request_failed)
+        page.on("response", self._on_response)
+        page.on("close", lambda closed_page: self._forget(closed_page))
+        await self.set_phase_async(page, phase)
+
+    def set_phase(self, page, phase):
+        """switches the blocking profile of a page (sync API), no-op for pages that aren't attached"""
+        session = self._sessions.get(page)
+        if session is None or self._phases.get(page) == phase:
+            return
+        try:
+            session.send("Network.setBlockedURLs", {"urls": blocked_patterns_for_phase(phase)})
+            self._phases[page] = phase
+        except Exception as e:
+            print(f"⚠️ Could not switch resource blocking to '{phase}': {e}")
+
+    async def set_phase_async(self, page, phase):
+        """switches the blocking profile of a page (async API), no-op for pages that aren't attached"""
+        session = self._sessions.get(page)
+        if session is None or self._phases.get(page) == phase:
+            return
+        try:
+            await session.send("Network.setBlockedURLs", {"urls": blocked_patterns_for_phase(phase)})
+            self._phases[page] = phase
+        except Exception as e:
+            print(f"⚠️ Could not switch resource blocking to '{phase}': {e}")
+
+    def _forget(self, page):
+        self._sessions.pop(page, None)
+        self._phases.pop(page, None)
+
+    def _on_request_failed(self, request):
+        if "ERR_BLOCKED_BY_CLIENT" not in (request.failure or ""):
+            return
+        category = categorize_url(request.url)
+        if category:
+            with self._lock:
+                self.blocked_counts[category] += 1
+
+    def _on_response(self, response):
+        try:
+            size = int(response.headers.get("content-length", 0))
+        except (TypeError, ValueError):
+            return
+
+        category = categorize_url(response.url)
+        with self._lock:
+            self.transferred_bytes += size
+            if category and size:
+                self.observed_bytes[category] += size
+                self.observed_counts[category] += 1
+
+    def average_bytes(self, category):
+        """average transfer size of a category, from observed responses when we have some"""
+        if self.observed_counts[category]:
+            return self.observed_bytes[category] / self.observed_counts[category]
+        return DEFAULT_RESOURCE_BYTES[category]
+
+    def stats(self):
+        """returns a picklable summary, so worker processes can send theirs to the parent"""
+        with self._lock:
+            saved = {category: int(count * self.average_bytes(category)) for category, count in self.blocked_counts.items()}
+            return {
+                "blocked_counts": dict(self.blocked_counts),
+                "bytes_saved": saved,
+                "transferred_bytes": self.transferred_bytes,
+            }
+
+
+def merge_stats(all_stats):
+    """adds up the stats of several blockers (e.g. one per worker process)"""
+    merged = {
+        "blocked_counts": {category: 0 for category in RESOURCE_PATTERNS},
+        "bytes_saved": {category: 0 for category in RESOURCE_PATTERNS},
+        "transferred_bytes": 0,
+    }
+    for stats in all_stats:
+        for category in RESOURCE_PATTERNS:
+            merged["blocked_counts"][category] += stats["blocked_counts"].get(category, 0)
+            merged["bytes_saved"][category] += stats["bytes_saved"].get(category, 0)
+        merged["transferred_bytes"] += stats["transferred_bytes"]
+    return merged
+
+
+def print_blocking_report(stats):
+    """prints how many requests were blocked and the estimated bandwidth saved"""
+    total_saved = sum(stats["bytes_saved"].values())
+    total_blocked = sum(stats["blocked_counts"].values())
+    print(f"🛡️ Resource blocking: {total_blocked} requests blocked, ~{total_saved / 1_048_576:.1f} MB saved "
+          f"({stats['transferred_bytes'] / 1_048_576:.1f} MB transferred)")
+    for category, count in stats["blocked_counts"].items():
+        if count:
+            print(f"   🚫 {category}: {count} requests, ~{stats['bytes_saved'][category] / 1_048_576:.1f} MB")
+
+
+# Blocker shared by every page of this process
+RESOURCE_BLOCKER = ResourceBlocker()
@@ -1,5 +1,6 @@
 # review_scraper_ultra_fast.py
 from patchright.sync_api import Page, TimeoutError
+from selector_registry import SELECTORS
 import time
 import csv
 import os
@@ -10,91 +11,93 @@ def sanitize_filename(name: str) -> str:
     return quote(name.strip().replace(" ", "_"), safe="")
 
 
-def extract_all_reviews_single_pass(page: Page) -> list:
-    """ULTRA-FAST: Extract ALL reviews in a single JavaScript execution"""
-
-    js_code = """
-    () => {
-        const reviews = [];
-        const reviewBlocks = document.querySelectorAll('div.jJc9Ad');
-
-        reviewBlocks.forEach((block, index) => {
-            try {
-                // Extract author
-                const authorElement = block.querySelector('.d4r55');
-                if (!authorElement) return;
-                const author = authorElement.textContent.trim();
-
-                // Extract rating
-                let rating = null;
-                const ratingElement = block.querySelector('.kvMYJc');
-                if (ratingElement) {
-                    const ratingAttr = ratingElement.getAttribute('aria-label') || '';
-                    if (ratingAttr.toLowerCase().includes('star')) {
-                        const ratingParts = ratingAttr.split(' ');
-                        for (const part of ratingParts) {
-                            if (part.replace('.', '').match(/^\\d+$/)) {
-                                rating = parseFloat(part);
-                                break;
-                            }
+# Extracts every loaded review block in one round trip
+REVIEWS_JS = """
+() => {
+    const reviews = [];
+    const reviewBlocks = document.querySelectorAll('div.jJc9Ad');
+
+    reviewBlocks.forEach((block, index) => {
+        try {
+            // Extract author
+            const authorElement = block.querySelector('.d4r55');
+            if (!authorElement) return;
+            const author = authorElement.textContent.trim();
+
+            // Extract rating
+            let rating = null;
+            const ratingElement = block.querySelector('.kvMYJc');
+            if (ratingElement) {
+                const ratingAttr = ratingElement.getAttribute('aria-label') || '';
+                if (ratingAttr.toLowerCase().includes('star')) {
+                    const ratingParts = ratingAttr.split(' ');
+                    for (const part of ratingParts) {
+                        if (part.replace('.', '').match(/^\\d+$/)) {
+                            rating = parseFloat(part);
+                            break;
                         }
                     }
                 }
+            }
 
-                // Extract review text and business response
-                let customerReview = '';
-                let businessResponse = '';
+            // Extract review text and business response
+            let customerReview = '';
+            let businessResponse = '';
 
-                const textElements = block.querySelectorAll('.wiI7pd');
-                if (textElements.length >= 1) {
-                    customerReview = textElements[0].textContent.trim();
-                }
-                if (textElements.length >= 2) {
-                    businessResponse = textElements[1].textContent.trim();
-                }
+            const textElements = block.querySelectorAll('.wiI7pd');
+            if (textElements.length >= 1) {
+                customerReview = textElements[0].textContent.trim();
+            }
+            if (textElements.length >= 2) {
+                businessResponse = textElements[1].textContent.trim();
+            }
 
-                // Fallback for review text
-                if (!customerReview) {
-                    const fallbackSelectors = ['.MyEned', '.ZZnUNe', 'span.wiI7pd'];
-                    for (const selector of fallbackSelectors) {
-                        const fallbackElement = block.querySelector(selector);
-                        if (fallbackElement) {
-                            customerReview = fallbackElement.textContent.trim();
-                            break;
-                        }
+            // Fallback for review text
+            if (!customerReview) {
+                const fallbackSelectors = ['.MyEned', '.ZZnUNe', 'span.wiI7pd'];
+                for (const selector of fallbackSelectors) {
+                    const fallbackElement = block.querySelector(selector);
+                    if (fallbackElement) {
+                        customerReview = fallbackElement.textContent.trim();
+                        break;
                     }
                 }
+            }
 
-                // Extract date
-                let date = '';
-                const dateElement = block.querySelector('.rsqaWe');
-                if (dateElement) {
-                    date = dateElement.textContent.trim();
-                }
-
-                // Add review if we have meaningful data
-                if (author && customerReview) {
-                    reviews.push({
-                        reviewer_name: author,
-                        rating: rating,
-                        customer_review: customerReview,
-                        business_response: businessResponse,
-                        date: date,
-                        block_index: index
-                    });
-                }
+            // Extract date
+            let date = '';
+            const dateElement = block.querySelector('.rsqaWe');
+            if (dateElement) {
+                date = dateElement.textContent.trim();
+            }
 
-            } catch (error) {
-                console.log('Error processing review:', error);
+            // Add review if we have meaningful data
+            if (author && customerReview) {
+                reviews.push({
+                    reviewer_name: author,
+                    rating: rating,
+                    customer_review: customerReview,
+                    business_response: businessResponse,
+                    date: date,
+                    block_index: index
+                });
             }
-        });
 
-        return reviews;
-    }
-    """
+        } catch (error) {
+            console.log('Error processing review:', error);
+        }
+    });
+
+    return reviews;
+}
+"""
+
+
+def extract_all_reviews_single_pass(page: Page) -> list:
+    """ULTRA-FAST: Extract ALL reviews in a single JavaScript execution"""
 
     try:
-        return page.evaluate(js_code)
+        return page.evaluate(REVIEWS_JS)
     except Exception as e:
         print(f"⚠️ JavaScript review extraction failed: {e}")
         return []
@@ -193,21 +196,11 @@ def scrape_reviews(page: Page, business_name: str, output_dir: str = "output/rev
             return filename
 
         # Step 3: Quick scroll container detection
-        scrollable = None
-        possible_containers = [
-            "div.m6QErb.DxyBCb.kA9KIf.dS8AEf",
-            "div[role='main'] div[style*='overflow']",
-            "div.m6QErb[aria-label]",
-        ]
-
-        for container_selector in possible_containers:
-            container = page.locator(container_selector).filter(has=page.locator("div.jJc9Ad")).first
-            if container.count() > 0:
-                scrollable = container
-                print(f"✅ Found scroll container: {container_selector}")
-                break
+        scrollable, container_selector = SELECTORS.find(page, "reviews_container", has="div.jJc9Ad")
+        if scrollable is not None:
+            print(f"✅ Found scroll container: {container_selector}")
 
-        if scrollable is None or scrollable.count() == 0:
+        if scrollable is None:
             print("⚠️ Using body for scrolling")
             scrollable = page.locator("body")
 
@@ -218,64 +211,8 @@ def scrape_reviews(page: Page, business_name: str, output_dir: str = "output/rev
         print(f"\n🎯 ULTRA-FAST collection completed in {elapsed:.1f}s!")
         print(f"📝 Total reviews collected: {len(reviews_data)}")
 
-        # Step 5: Final deduplication and cleanup
-        unique_reviews = []
-        final_seen = set()
-
-        for r in reviews_data:
-            # Create unique key from reviewer name + review text + date
-            review_key = (r["reviewer_name"], r["customer_review"][:100], r["date"])
-
-            if review_key not in final_seen:
-                final_seen.add(review_key)
-                # Clean up the review data (remove block_index)
-                clean_review = {
-                    "reviewer_name": r["reviewer_name"],
-                    "rating": r["rating"],
-                    "customer_review": r["customer_review"],
-                    "business_response": r["business_response"],
-                    "date": r["date"]
-                }
-                unique_reviews.append(clean_review)
-
-        print(f"📋 After deduplication: {len(unique_reviews)} unique reviews")
-
-        # Step 6: Quick save
-        if unique_reviews:
-            with open(filename, 'w', encoding='utf-8', newline='') as f:
-                fieldnames = ["reviewer_name", "rating", "customer_review", "business_response", "date"]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(unique_reviews)
-            print(f"✅ Saved {len(unique_reviews)} reviews to {filename}")
-
-            # Quick stats
-            rating_counts = {}
-            business_responses = 0
-
-            for review in unique_reviews:
-                rating = review["rating"] or "No rating"
-                rating_counts[rating] = rating_counts.get(rating, 0) + 1
-                if review["business_response"]:
-                    business_responses += 1
-
-            print(f"\n⭐ Rating summary: {dict(list(rating_counts.items())[:5])}")  # Top 5 ratings only
-            print(f"💬 Business responses: {business_responses}/{len(unique_reviews)}")
-
-            # Sample reviews (first 2 only for speed)
-            print("\n📋 Sample reviews:")
-            for i, review in enumerate(unique_reviews[:2]):
-                text_preview = review["customer_review"][:80] + "..." if len(review["customer_review"]) > 80 else \
-                review["customer_review"]
-                rating_text = f"({review['rating']} stars)" if review['rating'] else "(No rating)"
-                print(f"   {i + 1}. {review['reviewer_name']} {rating_text}: {text_preview}")
-
-                if review["business_response"]:
-                    response_preview = review["business_response"][:60] + "..." if len(
-                        review["business_response"]) > 60 else review["business_response"]
-                    print(f"      Business: {response_preview}")
-
-        else:
+        # Step 5 + 6: Final deduplication, cleanup and save
+        if not save_reviews(reviews_data, filename):
             print("❌ No reviews extracted")
             # Minimal debugging
             debug_count = page.locator('div.jJc9Ad').count()
@@ -286,4 +223,65 @@ def scrape_reviews(page: Page, business_name: str, output_dir: str = "output/rev
         import traceback
         traceback.print_exc()
 
-    return filename
\ No newline at end of file
+    return filename
+
+
+def save_reviews(reviews_data: list, filename: str) -> list:
+    """Deduplicates the collected reviews and saves them to csv, returns the unique reviews"""
+    unique_reviews = []
+    final_seen = set()
+
+    for r in reviews_data:
+        # Create unique key from reviewer name + review text + date
+        review_key = (r["reviewer_name"], r["customer_review"][:100], r["date"])
+
+        if review_key not in final_seen:
+            final_seen.add(review_key)
+            # Clean up the review data (remove block_index)
+            clean_review = {
+                "reviewer_name": r["reviewer_name"],
+                "rating": r["rating"],
+                "customer_review": r["customer_review"],
+                "business_response": r["business_response"],
+                "date": r["date"]
+            }
+            unique_reviews.append(clean_review)
+
+    print(f"📋 After deduplication: {len(unique_reviews)} unique reviews")
+
+    # Step 6: Quick save
+    if unique_reviews:
+        with open(filename, 'w', encoding='utf-8', newline='') as f:
+            fieldnames = ["reviewer_name", "rating", "customer_review", "business_response", "date"]
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(unique_reviews)
+        print(f"✅ Saved {len(unique_reviews)} reviews to {filename}")
+
+        # Quick stats
+        rating_counts = {}
+        business_responses = 0
+
+        for review in unique_reviews:
+            rating = review["rating"] or "No rating"
+            rating_counts[rating] = rating_counts.get(rating, 0) + 1
+            if review["business_response"]:
+                business_responses += 1
+
+        print(f"\n⭐ Rating summary: {dict(list(rating_counts.items())[:5])}")  # Top 5 ratings only
+        print(f"💬 Business responses: {business_responses}/{len(unique_reviews)}")
+
+        # Sample reviews (first 2 only for speed)
+        print("\n📋 Sample reviews:")
+        for i, review in enumerate(unique_reviews[:2]):
+            text_preview = review["customer_review"][:80] + "..." if len(review["customer_review"]) > 80 else \
+            review["customer_review"]
+            rating_text = f"({review['rating']} stars)" if review['rating'] else "(No rating)"
+            print(f"   {i + 1}. {review['reviewer_name']} {rating_text}: {text_preview}")
+
+            if review["business_response"]:
+                response_preview = review["business_response"][:60] + "..." if len(
+                    review["business_response"]) > 60 else review["business_response"]
+                print(f"      Business: {response_preview}")
+
+    return unique_reviews
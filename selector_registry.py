@@ -0,0 +1,179 @@
+"""Central registry of the fallback selectors for Google Maps UI targets, with learned ordering.
+
+Google Maps ships several markups for the same control (the Overview tab, the photos button,
+the reviews scroll container), so every target has a list of fallback selectors and each
+probe that misses costs a round trip to the browser. The registry remembers which selector
+actually matched: it tries the historically winning one first and keeps per-selector hit
+and miss counts in a JSON stats file, so later runs start with the learned order.
+"""
+from metrics import METRICS
+import json
+import os
+import threading
+
+# Fallback selectors of every UI target, in the order tried before anything was learned
+UI_TARGETS = {
+    "overview_tab": [
+        "button[role='tab'] >> text=Overview",
+        "div[role='tab'] >> text=Overview",
+        "button[data-value='Overview']",
+        "//button[@role='tab' and contains(text(), 'Overview')]",
+        "//div[@role='tab' and contains(text(), 'Overview')]",
+        "//button[contains(text(), 'Overview')]",
+        "[data-tab-index='0']",
+        "div[role='tablist'] button:first-child",
+    ],
+    "photos_button": [
+        '[data-value="all_photos"]',
+        'button[data-carousel-index="0"]',
+        'button:has-text("photos")',
+        'button:has-text("Photo")',
+        '[role="button"]:has-text("Photo")',
+    ],
+    "reviews_container": [
+        "div.m6QErb.DxyBCb.kA9KIf.dS8AEf",
+        "div[role='main'] div[style*='overflow']",
+        "div.m6QErb[aria-label]",
+    ],
+}
+
+# Weight of the newest outcome in a selector's score, so a markup change reorders within a few pages
+SCORE_SMOOTHING = 0.2
+
+# Score of a selector that was never probed: below a proven winner, above a proven miss
+UNTRIED_SCORE = 0.5
+
+
+class SelectorRegistry:
+    """Per-target selector stats, stored as JSON at path.
+
+    Worker processes load the stats for the ordering but don't write them; they hand their
+    observations to the parent, which is the only writer of the file.
+    """
+
+    def __init__(self, targets=UI_TARGETS):
+        self._lock = threading.Lock()
+        self.targets = targets
+        self.path = None
+        self.stats = {}
+        self.observations = []
+
+    def load(self, path="output/selector_stats.json", writable=True):
+        """reads the stats of previous runs; save() writes them back only if writable"""
+        self.path = path if writable else None
+        with self._lock:
+            self.stats = {}
+            self.observations = []
+            if path and os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    self.stats = json.load(f)
+
+    def _selector_stats(self, target, selector):
+        target_stats = self.stats.setdefault(target, {"unmatched": 0, "selectors": {}})
+        return target_stats["selectors"].setdefault(selector, {"hits": 0, "misses": 0, "score": UNTRIED_SCORE})
+
+    def ordered(self, target):
+        """the fallback selectors of a target, best score first (ties in registration order)"""
+        with self._lock:
+            selectors = self.stats.get(target, {}).get("selectors", {})
+            return sorted(self.targets[target],
+                          key=lambda selector: -selectors.get(selector, {}).get("score", UNTRIED_SCORE))
+
+    def record(self, target, missed, matched=None):
+        """adds the outcome of one lookup: the selectors probed in vain and the one that matched (None if none did)"""
+        with self._lock:
+            self.observations.append((target, list(missed), matched))
+            for selector in missed:
+                selector_stats = self._selector_stats(target, selector)
+                selector_stats["misses"] += 1
+                # Without a match the element just isn't on the page (no photos, no reviews) - keep the order
+                if matched is not None:
+                    selector_stats["score"] *= 1 - SCORE_SMOOTHING
+            if matched is None:
+                self.stats.setdefault(target, {"unmatched": 0, "selectors": {}})["unmatched"] += 1
+            else:
+                selector_stats = self._selector_stats(target, matched)
+                selector_stats["hits"] += 1
+                selector_stats["score"] = SCORE_SMOOTHING + (1 - SCORE_SMOOTHING) * selector_stats["score"]
+
+    def _lookup_done(self, target, missed, matched=None):
+        self.record(target, missed, matched)
+        if missed:
+            METRICS.count("selector_misses", len(missed), target=target)
+
+    def _locator(self, page, selector, has=None):
+        locator = page.locator(selector)
+        if has:
+            locator = locator.filter(has=page.locator(has))
+        return locator.first
+
+    def find(self, page, target, has=None, visible=False):
+        """(locator, selector) of the first matching fallback of a target (sync API), (None, None) if none matches.
+
+        has keeps only elements containing a match of that selector; visible requires the element
+        to be visible (one is_visible() round trip per probe instead of count() plus is_visible()).
+        """
+        missed = []
+        for selector in self.ordered(target):
+            locator = self._locator(page, selector, has)
+            try:
+                found = locator.is_visible() if visible else locator.count() > 0
+            except Exception:
+                found = False
+            if found:
+                self._lookup_done(target, missed, selector)
+                return locator, selector
+            missed.append(selector)
+        self._lookup_done(target, missed)
+        return None, None
+
+    async def find_async(self, page, target, has=None, visible=False):
+        """(locator, selector) of the first matching fallback of a target (async API), (None, None) if none matches"""
+        missed = []
+        for selector in self.ordered(target):
+            locator = self._locator(page, selector, has)
+            try:
+                found = await locator.is_visible() if visible else await locator.count() > 0
+            except Exception:
+                found = False
+            if found:
+                self._lookup_done(target, missed, selector)
+                return locator, selector
+            missed.append(selector)
+        self._lookup_done(target, missed)
+        return None, None
+
+    def merge(self, observations):
+        """replays the lookups of a worker process"""
+        for target, missed, matched in observations:
+            self.record(target, missed, matched)
+
+    def save(self):
+        """writes the stats file atomically, no-op for read-only stats"""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.stats, f, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def print_report(self):
+        """prints the learned order of every target with the hit and miss counts of its selectors"""
+        if not self.stats:
+            return
+        print(f"🎯 Selectors ({len(self.observations)} lookups this run):")
+        for target in self.targets:
+            target_stats = self.stats.get(target)
+            if not target_stats:
+                continue
+            print(f"   🎯 {target}: {target_stats['unmatched']} lookups without a match")
+            for selector in self.ordered(target):
+                selector_stats = target_stats["selectors"].get(selector)
+                if selector_stats:
+                    print(f"      {selector_stats['hits']:>6} hits {selector_stats['misses']:>6} misses  {selector}")
+
+
+# Selector stats shared by every page of this process
+SELECTORS = SelectorRegistry()
@@ -0,0 +1,29 @@
+"""TilePlanner split decisions"""
+from geo_tiles import TilePlanner, parse_tile_label
+
+
+def test_saturated_tile_splits_into_quadrants():
+    planner = TilePlanner(saturation=100, max_zoom=13)
+
+    quadrants = planner.record("@31.2500,-85.5000,9z", 120)
+
+    assert len(quadrants) == 4
+    assert all(parse_tile_label(label).zoom == 10 for label in quadrants)
+    assert planner.take_splits() == quadrants
+    assert planner.take_splits() == []
+
+
+def test_unsaturated_and_deepest_tiles_stay_whole():
+    planner = TilePlanner(saturation=100, max_zoom=13)
+
+    assert planner.record("@31.2500,-85.5000,9z", 99) == []
+    assert planner.record("@31.2500,-85.5000,13z", 120) == []
+    assert planner.record("Tifton", 120) == []
+
+
+def test_only_splittable_tiles_skip_the_early_scroll_stop():
+    planner = TilePlanner(saturation=100, max_zoom=13)
+
+    assert planner.can_split("@31.2500,-85.5000,12z")
+    assert not planner.can_split("@31.2500,-85.5000,13z")
+    assert not planner.can_split("Tifton")
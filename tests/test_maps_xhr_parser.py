@@ -0,0 +1,52 @@
+"""parse_places against a saved /search?tbm=map response"""
+import json
+import os
+
+from maps_xhr_parser import parse_places
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "xhr_search_tifton.json")
+
+
+def read_fixture():
+    with open(FIXTURE, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_prefixed_search_payload():
+    places = parse_places(read_fixture())
+
+    assert [place["name"] for place in places] == ["Tifton Turf Farm", "Southern Sod Co"]
+    farm = places[0]
+    assert farm["place_id"] == "0x88ec1a2b3c4d5e6f:0x1a2b3c4d5e6f7a8b"
+    assert farm["address"] == "4411 US-41, Tifton, GA 31794"
+    assert farm["website"] == "https://tiftonturf.example.com/"
+    assert farm["phone_number"] == "(229) 555-0142"
+    assert farm["reviews_count"] == 128
+    assert farm["reviews_average"] == 4.7
+    assert (farm["latitude"], farm["longitude"]) == (31.4505, -83.5085)
+    assert farm["category"] == "Sod supplier"
+    assert farm["google_maps_url"].endswith("!1s0x88ec1a2b3c4d5e6f:0x1a2b3c4d5e6f7a8b")
+
+
+def test_missing_phone_and_rating_are_none():
+    place = parse_places(read_fixture())[1]
+
+    assert place["place_id"] == "0x88ec0f00d00d00d0:0x00000000beef0001"
+    assert place["phone_number"] is None
+    assert place["website"] is None
+    assert place["reviews_count"] is None
+    assert place["reviews_average"] is None
+    assert place["category"] == "Sod supplier"
+
+
+def test_envelope_payload():
+    envelope = json.dumps({"c": 0, "d": read_fixture()}) + '/*""*/'
+
+    assert parse_places(envelope) == parse_places(read_fixture())
+
+
+def test_junk_input():
+    assert parse_places("") == []
+    assert parse_places("<html>not json</html>") == []
+    assert parse_places(")]}'\n{\"c\":0}") == []
+    assert parse_places(")]}'\n[[1, 2, [\"0xzz:0x1\", \"No place\"]]]") == []
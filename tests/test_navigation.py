@@ -0,0 +1,21 @@
+"""navigation_outcome only charges Google pages to the proxy"""
+from types import SimpleNamespace
+
+from navigation import navigation_outcome
+
+
+def response(status):
+    return SimpleNamespace(status=status)
+
+
+def test_google_pages():
+    assert navigation_outcome(response(200), "https://www.google.com/maps/search/sod") == (True, False)
+    assert navigation_outcome(response(429), "https://www.google.com/maps/search/sod") == (False, True)
+    assert navigation_outcome(response(200), "https://www.google.com/sorry/index?continue=x") == (False, True)
+    assert navigation_outcome(response(503), "https://www.google.com/maps") == (False, False)
+
+
+def test_business_websites_are_not_charged():
+    assert navigation_outcome(response(403), "https://tiftonturf.example.com/") == (True, False)
+    assert navigation_outcome(response(503), "https://tiftonturf.example.com/contact") == (True, False)
+    assert navigation_outcome(None, "https://tiftonturf.example.com/") == (True, False)
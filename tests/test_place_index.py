@@ -0,0 +1,88 @@
+"""canonical_place_id and the persistent PlaceIndex"""
+from place_index import PlaceIndex, canonical_place_id
+
+FEATURE_ID = "0x88ec1a2b3c4d5e6f:0x1a2b3c4d5e6f7a8b"
+
+
+def test_feature_id_ignores_search_coordinates():
+    first = ("https://www.google.com/maps/place/Tifton+Turf+Farm/@31.45,-83.50,17z/"
+             "data=!4m6!3m5!1s0x88EC1A2B3C4D5E6F:0x1A2B3C4D5E6F7A8B!8m2!3d31.45!4d-83.50")
+    second = ("https://www.google.com/maps/place/Tifton+Turf+Farm/@31.60,-83.20,12z/"
+              "data=!3m1!4b1!4m6!3m5!1s0x88ec1a2b3c4d5e6f:0x1a2b3c4d5e6f7a8b!16s%2Fg%2F11abc?entry=ttu")
+
+    assert canonical_place_id(first) == FEATURE_ID
+    assert canonical_place_id(second) == FEATURE_ID
+
+
+def test_knowledge_graph_id():
+    url = "https://www.google.com/maps/place/Southern+Sod/data=!4m2!3m1!16s%2Fg%2F11c5xyz_12?hl=en"
+
+    assert canonical_place_id(url) == "/g/11c5xyz_12"
+
+
+def test_query_parameters():
+    assert canonical_place_id("https://maps.google.com/?ftid=0xAB:0xCD") == "0xab:0xcd"
+    assert canonical_place_id("https://maps.google.com/?cid=1234567890") == "cid:1234567890"
+
+
+def test_path_fallback_drops_coordinates_and_query():
+    url = "https://www.google.com/maps/place/Sod%20Farm/@31.4,-83.5,12z?entry=ttu"
+
+    assert canonical_place_id(url) == "www.google.com/maps/place/Sod Farm"
+
+
+def test_empty_url():
+    assert canonical_place_id("") == ""
+    assert canonical_place_id(None) is None
+
+
+def test_add_skips_indexed_places(tmp_path):
+    index = PlaceIndex(str(tmp_path / "place_index.txt"))
+
+    index.add(["a", "b", "a"])
+    index.add(["b", "c"])
+
+    assert index.load() == {"a", "b", "c"}
+    with open(index.pending_path, encoding='utf-8') as f:
+        assert f.read().split() == ["a", "b", "c"]
+
+
+def test_places_stay_pending_until_commit(tmp_path):
+    path = str(tmp_path / "place_index.txt")
+    index = PlaceIndex(path)
+    index.add(["a", "b"])
+
+    assert not (tmp_path / "place_index.txt").exists()
+    assert index.commit() == 2
+    assert index.commit() == 0
+    assert not (tmp_path / "place_index.txt.pending").exists()
+    assert PlaceIndex(path).load() == {"a", "b"}
+
+
+def test_discard_pending_keeps_committed_places(tmp_path):
+    path = str(tmp_path / "place_index.txt")
+    index = PlaceIndex(path)
+    index.add(["a"])
+    index.commit()
+    # A crashed run leaves its places pending
+    index.add(["b"])
+
+    rerun = PlaceIndex(path)
+    rerun.discard_pending()
+
+    assert rerun.load() == {"a"}
+    rerun.add(["b"])
+    assert rerun.load() == {"a", "b"}
+
+
+def test_instances_share_the_files(tmp_path):
+    path = str(tmp_path / "place_index.txt")
+    worker1, worker2 = PlaceIndex(path), PlaceIndex(path)
+    worker1.add(["a", "b"])
+    worker2.add(["b", "c"])
+
+    parent = PlaceIndex(path)
+    assert parent.load() == {"a", "b", "c"}
+    assert parent.commit() == 3
+    with open(path, encoding='utf-8') as f:
+        assert sorted(f.read().split()) == ["a", "b", "c"]
@@ -0,0 +1,89 @@
+"""replay_bench.py against the committed feed, place, review and photo recordings (the replays need Chromium)"""
+import json
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip("patchright")
+pytest.importorskip("dotenv")
+
+from patchright.sync_api import sync_playwright
+
+import replay_bench
+from main import Business
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "replay")
+
+
+@pytest.fixture(scope="module")
+def chromium():
+    """skips the replays when Chromium can't start (python -m patchright install chromium)"""
+    try:
+        with sync_playwright() as p:
+            p.chromium.launch(headless=True).close()
+    except Exception as e:
+        pytest.skip(f"Chromium can't start: {str(e).splitlines()[0]}")
+
+
+def run_replay(fixtures, *options):
+    args = replay_bench.build_arg_parser().parse_args(["--fixtures", fixtures, "replay", "--runs", "1", *options])
+    return replay_bench.replay(args)
+
+
+def test_fixtures_cover_every_kind():
+    store = replay_bench.FixtureStore(FIXTURES)
+
+    assert {scenario["kind"] for scenario in store.scenarios} == {"feed", "place", "reviews", "images"}
+    for scenario in store.scenarios:
+        if "har" in scenario:
+            with open(store.file(scenario["har"]), encoding='utf-8') as f:
+                entries = json.load(f)["log"]["entries"]
+            assert [entry["request"]["url"] for entry in entries] == [scenario["url"]]
+            assert entries[0]["response"]["status"] == 200
+        else:
+            assert os.path.exists(store.file(scenario["html"]))
+
+
+def test_recall_and_business_match():
+    assert replay_bench.recall([], ["anything"]) == 1.0
+    assert replay_bench.recall(["a", "b", "c", "d"], ["a", "b", "x"]) == 0.5
+
+    expected = {"name": "Tifton Turf Farm", "reviews_count": 128, "reviews_average": 4.7}
+    business = Business(name="Tifton Turf Farm", reviews_count=128, reviews_average=4.5)
+    fields = len(replay_bench.BUSINESS_FIELDS)
+    # The fields missing on both sides (address, website...) match too
+    assert replay_bench.business_match(expected, business) == (fields - 1) / fields
+    assert replay_bench.business_match(expected, None) == 0.0
+
+
+def test_freeze_html_strips_scripts():
+    html = '<div>kept</div><script src="app.js"></script><SCRIPT>\nrender();\n</SCRIPT>'
+
+    assert replay_bench.freeze_html(html) == "<div>kept</div>"
+
+
+def test_recordings_replay_correctly(chromium, monkeypatch, tmp_path):
+    # replay() moves to a throwaway directory, monkeypatch restores the working directory
+    monkeypatch.chdir(tmp_path)
+
+    assert run_replay(FIXTURES) == 0
+
+
+def test_missing_items_fail_the_replay(chromium, monkeypatch, tmp_path):
+    fixtures = tmp_path / "fixtures"
+    shutil.copytree(FIXTURES, fixtures)
+    manifest_path = fixtures / replay_bench.MANIFEST
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    for scenario in manifest["scenarios"]:
+        if scenario["kind"] == "feed":
+            scenario["expected"]["place_ids"].append("0x0:0x0")
+        elif scenario["kind"] == "place":
+            scenario["expected"]["name"] = "Not this farm"
+        else:
+            scenario["expected"]["keys"].append("not on the page")
+    manifest_path.write_text(json.dumps(manifest), encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+
+    for kind in ("feed", "place", "reviews", "images"):
+        assert run_replay(str(fixtures), "--min-recall", "1.0", "--only", kind) == 1
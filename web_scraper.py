@@ -3,10 +3,12 @@ from google import genai
 from bs4 import BeautifulSoup
 import pandas as pd
 import json
-import time
-import random
-from patchright.sync_api import sync_playwright, ProxySettings
-import os
+from patchright.sync_api import sync_playwright
+from browser_session import BrowserSession
+from navigation import goto
+from proxy_pool import PROXY_POOL, print_proxy_report
+from pacing import PACER, print_pacing_report
+from metrics import METRICS, print_phase_report
 from urllib.parse import urljoin, urlparse
 import logging
 import re
@@ -17,12 +19,6 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-PROXY: ProxySettings = {
-    "server": f"http://{os.getenv('PROXY_HOST')}:{os.getenv('PROXY_PORT')}",
-    "username": os.getenv("PROXY_USERNAME"),
-    "password": os.getenv("PROXY_PASSWORD")
-}
-
 
 def clean_html_content(html_content):
     """Clean HTML content and extract readable text with better sod-related content focus"""
@@ -115,9 +111,6 @@ def attempt_scrape_single_url(url, page, context):
             'Upgrade-Insecure-Requests': '1',
         })
 
-        # Random delay before navigation
-        time.sleep(random.uniform(1, 2))
-
         # Try multiple navigation strategies
         content_loaded = False
         strategies = [
@@ -131,9 +124,9 @@ def attempt_scrape_single_url(url, page, context):
             try:
                 logger.info(f"Trying navigation strategy: {strategy} with {timeout / 1000}s timeout")
                 if strategy:
-                    page.goto(url, timeout=timeout, wait_until=strategy)
+                    goto(page, url, timeout=timeout, wait_until=strategy)
                 else:
-                    page.goto(url, timeout=timeout)
+                    goto(page, url, timeout=timeout)
 
                 content_loaded = True
                 logger.info(f"Successfully loaded page with strategy: {strategy}")
@@ -149,13 +142,19 @@ def attempt_scrape_single_url(url, page, context):
         if not content_loaded:
             return None
 
-        # Wait for content to load with random delay
-        page.wait_for_timeout(random.randint(2000, 4000))
+        # Wait for late content until the network goes quiet, rather than a random delay
+        try:
+            page.wait_for_load_state("networkidle", timeout=4000)
+        except Exception:
+            pass
 
         # Scroll down to load any lazy content
         try:
             page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            page.wait_for_timeout(2000)
+            try:
+                page.wait_for_load_state("networkidle", timeout=2000)
+            except Exception:
+                pass
             page.evaluate("window.scrollTo(0, 0)")
         except:
             pass
@@ -413,39 +412,43 @@ def main():
         if col not in df.columns:
             df[col] = '' if col != 'content_length' else 0
 
+    METRICS.configure("web_scraper", "output/metrics")
+
     # Initialize Playwright with enhanced settings
     with sync_playwright() as p:
-        # Launch browser with additional options
-        browser = p.chromium.launch(
-            headless=False,
-            args=[
-                '--no-sandbox',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--disable-gpu',
-                '--no-first-run',
-                '--no-default-browser-check',
-                '--disable-extensions'
-            ],
-            proxy=PROXY
+        # Launch browser with additional options, on the healthiest proxy of the pool
+        session = BrowserSession(
+            p,
+            launch_options={
+                'args': [
+                    '--no-sandbox',
+                    '--disable-blink-features=AutomationControlled',
+                    '--disable-dev-shm-usage',
+                    '--disable-gpu',
+                    '--no-first-run',
+                    '--no-default-browser-check',
+                    '--disable-extensions'
+                ]
+            },
+            context_options={
+                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'viewport': {'width': 1920, 'height': 1080},
+                'ignore_https_errors': True,
+                'java_script_enabled': True,
+                'bypass_csp': True,
+                'extra_http_headers': {
+                    'Accept-Language': 'en-US,en;q=0.9',
+                    'Accept-Encoding': 'gzip, deflate, br',
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                    'Cache-Control': 'no-cache',
+                    'Pragma': 'no-cache'
+                }
+            },
+            block_resources=False
         )
 
-        context = browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080},
-            ignore_https_errors=True,
-            java_script_enabled=True,
-            bypass_csp=True,
-            extra_http_headers={
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Cache-Control': 'no-cache',
-                'Pragma': 'no-cache'
-            }
-        )
-
-        page = context.new_page()
+        page = session.open()
+        context = session.context
 
         # Process each row
         for index, row in df.iterrows():
@@ -478,15 +481,22 @@ def main():
 
             logger.info(f"Processing row {index}/{len(df) - 1}: {url}")
 
+            # Move to another proxy once the current one got tripped
+            if session.proxy_tripped:
+                page = session.recycle()
+                context = session.context
+
             try:
                 # Scrape website content
-                content = scrape_website(url, page, context)
+                with METRICS.timer("enrichment", step="scrape"):
+                    content = scrape_website(url, page, context)
 
                 if content:
                     df.at[index, 'content_length'] = len(content)
 
                     # Extract all business data using AI
-                    business_data = extract_business_data_with_ai(content, client, url)
+                    with METRICS.timer("enrichment", step="ai"):
+                        business_data = extract_business_data_with_ai(content, client, url)
 
                     # Update dataframe with all extracted data
                     df.at[index, 'sod_types'] = json.dumps(business_data['sod_types'])
@@ -511,28 +521,30 @@ def main():
                 logger.error(f"Row {index}: Error processing {url}: {str(e)}")
                 df.at[index, 'scrape_status'] = f'error: {str(e)[:100]}'
                 df.at[index, 'scrape_timestamp'] = pd.Timestamp.now()
+            METRICS.count("websites_processed")
 
             # Save progress after each row
             try:
-                df.to_csv("output/all_usa_sod_farms_citywise_progress.csv", index=False)
+                with METRICS.timer("save"):
+                    df.to_csv("output/all_usa_sod_farms_citywise_progress.csv", index=False)
             except Exception as e:
                 logger.error(f"Failed to save progress: {e}")
-
-            # Random delay between requests
-            delay = random.uniform(3, 7)
-            logger.info(f"Waiting {delay:.1f} seconds before next request...")
-            time.sleep(delay)
+            METRICS.write_prometheus()
 
             # Optional: Process only first N rows for testing
             # if index >= 2:  # Uncomment to limit processing
             #     break
 
         # Close browser
-        browser.close()
+        session.close()
+
+    print_proxy_report(PROXY_POOL.stats())
+    print_pacing_report(PACER.stats())
 
     # Save final results
     try:
-        df.to_csv("output/all_usa_sod_farms_comprehensive_data.csv", index=False)
+        with METRICS.timer("save"):
+            df.to_csv("output/all_usa_sod_farms_comprehensive_data.csv", index=False)
         logger.info("Processing complete! Results saved to output/all_usa_sod_farms_comprehensive_data.csv")
     except Exception as e:
         logger.error(f"Failed to save final results: {e}")
@@ -549,6 +561,8 @@ def main():
     logger.info(f"Total sod types found: {total_sod_types}")
     logger.info(f"Businesses with email: {businesses_with_email}")
     logger.info(f"Businesses with description: {businesses_with_description}")
+    print_phase_report(METRICS.snapshot())
+    METRICS.close()
 
     # Show sample detailed results
     logger.info("\n--- SAMPLE RESULTS ---")